@@ -3,11 +3,15 @@ AI 기반 사용자 성향 분석 모듈
 OpenAI GPT를 사용하여 수집된 데이터로부터 심층적인 인사이트 생성
 """
 import json
+import math
 import os
 from datetime import datetime
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from analysis_cache import make_cache_key
+from data_aggregator import DataAggregator
 
 # 환경 변수 로드
 try:
@@ -26,6 +30,50 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("⚠️ OpenAI 라이브러리가 설치되지 않았습니다. pip install openai로 설치하세요.")
 
+# 사용할 OpenAI 모델과 프롬프트 버전 (프롬프트를 수정하면 버전을 올려 캐시를 무효화)
+AI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+PROMPT_VERSION = '1'
+
+# 분석 모드: 'separate' (섹션별 4회 호출) / 'combined' (요약을 한 번만 보내는 단일 JSON 호출)
+ANALYSIS_MODES = ('separate', 'combined')
+DEFAULT_ANALYSIS_MODE = os.getenv('AI_ANALYSIS_MODE', 'separate')
+
+# 통합 분석 응답 스키마 (dict: 필수 필드, list: 항목 타입, 그 외: 허용 타입)
+MBTI_DIMENSION_SCHEMA = {'score': (int, float), 'tendency': str, 'description': str}
+TRAIT_SCHEMA = {'score': (int, float), 'description': str}
+COMBINED_RESPONSE_SCHEMA = {
+    'ai_insights': {
+        'overview': str,
+        'strengths': str,
+        'work_style': str,
+        'interests': str
+    },
+    'mbti_analysis': {
+        'E_I': MBTI_DIMENSION_SCHEMA,
+        'S_N': MBTI_DIMENSION_SCHEMA,
+        'T_F': MBTI_DIMENSION_SCHEMA,
+        'J_P': MBTI_DIMENSION_SCHEMA,
+        'predicted_type': str,
+        'confidence': (int, float)
+    },
+    'personality_traits': {
+        'openness': TRAIT_SCHEMA,
+        'conscientiousness': TRAIT_SCHEMA,
+        'extraversion': TRAIT_SCHEMA,
+        'agreeableness': TRAIT_SCHEMA,
+        'neuroticism': TRAIT_SCHEMA,
+        'creativity': TRAIT_SCHEMA,
+        'tech_savviness': TRAIT_SCHEMA
+    },
+    'recommendations': {
+        'productivity_tools': [str],
+        'learning_resources': [str],
+        'software_apps': [str],
+        'work_style': [str],
+        'career_development': [str]
+    }
+}
+
 def convert_numpy_types(obj):
     """numpy 타입을 JSON 직렬화 가능한 Python 기본 타입으로 변환"""
     if isinstance(obj, np.integer):
@@ -41,10 +89,61 @@ def convert_numpy_types(obj):
     else:
         return obj
 
+def validate_schema(value: Any, schema: Any, path: str = '$') -> List[str]:
+    """값이 스키마를 만족하는지 검사하고 오류 메시지 목록 반환 (빈 목록이면 유효)"""
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return [f"{path}: 객체가 필요합니다"]
+        errors = []
+        for key, sub_schema in schema.items():
+            if key not in value:
+                errors.append(f"{path}.{key}: 누락되었습니다")
+            else:
+                errors.extend(validate_schema(value[key], sub_schema, f"{path}.{key}"))
+        return errors
+    
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{path}: 배열이 필요합니다"]
+        errors = []
+        for index, item in enumerate(value):
+            errors.extend(validate_schema(item, schema[0], f"{path}[{index}]"))
+        return errors
+    
+    # bool은 int의 하위 타입이므로 숫자 필드에서 제외
+    if isinstance(value, bool) or not isinstance(value, schema):
+        return [f"{path}: 타입이 올바르지 않습니다 ({type(value).__name__})"]
+    # json.loads는 NaN/Infinity도 float로 읽으므로 숫자는 유한한 값만 허용
+    if isinstance(value, float) and not math.isfinite(value):
+        return [f"{path}: 유한한 숫자가 필요합니다 ({value})"]
+    return []
+
+def get_analysis_cache_key(data_summary: Dict[str, Any], model: Optional[str] = None,
+                           mode: Optional[str] = None) -> str:
+    """정규화된 data_summary + 모델 + 프롬프트 버전(분석 모드 포함)으로 분석 결과 캐시 키 생성"""
+    prompt_version = f"{PROMPT_VERSION}-{mode or DEFAULT_ANALYSIS_MODE}"
+    return make_cache_key(convert_numpy_types(data_summary), model or AI_MODEL, prompt_version)
+
 class AIPersonalityAnalyzer:
-    def __init__(self, api_key: Optional[str] = None):
-        """AI 성향 분석기 초기화"""
+    def __init__(self, api_key: Optional[str] = None, concurrent: Optional[bool] = None,
+                 model: Optional[str] = None, mode: Optional[str] = None):
+        """AI 성향 분석기 초기화
+        
+        concurrent: 네 가지 OpenAI 호출을 동시에 실행할지 여부
+                    (None이면 AI_ANALYSIS_CONCURRENT 환경 변수, 기본값 True)
+        model: 사용할 OpenAI 모델 (None이면 AI_MODEL)
+        mode: 'separate' 또는 'combined' (None이면 AI_ANALYSIS_MODE 환경 변수, 기본값 'separate')
+        """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.model = model or AI_MODEL
+        self._token_callback = None
+        if concurrent is None:
+            concurrent = os.getenv('AI_ANALYSIS_CONCURRENT', 'true').lower() not in ('0', 'false', 'no')
+        self.concurrent = concurrent
+        self.mode = mode or DEFAULT_ANALYSIS_MODE
+        if self.mode not in ANALYSIS_MODES:
+            print(f"⚠️ 알 수 없는 분석 모드 '{self.mode}', 'separate' 모드를 사용합니다.")
+            self.mode = 'separate'
         
         if OPENAI_AVAILABLE and self.api_key:
             try:
@@ -59,37 +158,46 @@ class AIPersonalityAnalyzer:
             self.ai_enabled = False
             print(f"⚠️ OpenAI API 키가 없습니다. 기본 분석 모드로 작동합니다. (키: {self.api_key})")
     
-    def analyze_user_profile(self, data_summary: Dict[str, Any]) -> Dict[str, Any]:
-        """수집된 데이터를 종합하여 사용자 프로필 분석"""
+    def get_cache_key(self, data_summary: Dict[str, Any]) -> str:
+        """이 분석기 설정으로 분석한 결과의 캐시 키"""
+        return get_analysis_cache_key(data_summary, self.model, self.mode)
+    
+    def analyze_user_profile(self, data_summary: Dict[str, Any],
+                             progress_callback: Optional[Callable[[str, Any], None]] = None,
+                             token_callback: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """수집된 데이터를 종합하여 사용자 프로필 분석
+        
+        progress_callback: 섹션 분석이 끝날 때마다 (섹션 키, 섹션 결과)로 호출
+        token_callback: 모델 응답을 스트리밍하며 (섹션 키, 토큰 조각)으로 호출
+        """
+        self._token_callback = token_callback
         print(f"🔍 AI 분석 시작 - AI 활성화 상태: {self.ai_enabled}")
         print(f"🔑 API 키 존재: {bool(self.api_key)}")
         
         if not self.ai_enabled:
             print("⚠️ AI가 비활성화되어 기본 분석을 수행합니다.")
-            return self._get_basic_analysis(data_summary)
+            result = self._get_basic_analysis(data_summary)
+            self._notify_sections(progress_callback, result)
+            return result
         
         try:
-            print("🚀 AI 기반 분석을 시작합니다...")
+            print(f"🚀 AI 기반 분석을 시작합니다... (모드: {self.mode}, 동시 실행: {self.concurrent})")
             
             # AI 분석 수행
-            print("📊 AI 인사이트 생성 중...")
-            ai_insights = self._generate_ai_insights(data_summary)
-            
-            print("🧠 MBTI 분석 중...")
-            mbti_analysis = self._analyze_mbti(data_summary)
-            
-            print("🎯 성격 특성 분석 중...")
-            personality_traits = self._analyze_personality_traits(data_summary)
-            
-            print("💡 추천 생성 중...")
-            recommendations = self._generate_recommendations(data_summary)
+            if self.mode == 'combined':
+                sections = self._run_combined_analysis(data_summary)
+                self._notify_sections(progress_callback, sections)
+            elif self.concurrent:
+                sections = self._run_sections_concurrent(data_summary, progress_callback)
+            else:
+                sections = self._run_sections_sequential(data_summary, progress_callback)
             
             print("✅ AI 분석 완료!")
             return {
-                'ai_insights': ai_insights,
-                'mbti_analysis': mbti_analysis,
-                'personality_traits': personality_traits,
-                'recommendations': recommendations,
+                'ai_insights': sections['ai_insights'],
+                'mbti_analysis': sections['mbti_analysis'],
+                'personality_traits': sections['personality_traits'],
+                'recommendations': sections['recommendations'],
                 'analysis_timestamp': datetime.now().isoformat(),
                 'ai_powered': True
             }
@@ -97,15 +205,194 @@ class AIPersonalityAnalyzer:
             print(f"❌ AI 분석 실패, 기본 분석으로 전환: {e}")
             import traceback
             traceback.print_exc()
-            return self._get_basic_analysis(data_summary)
+            result = self._get_basic_analysis(data_summary)
+            self._notify_sections(progress_callback, result)
+            return result
+    
+    def _get_analysis_sections(self):
+        """분석 섹션 목록 반환 (결과 키, 진행 메시지, 분석 함수, 실패 시 기본값 함수)"""
+        return [
+            ('ai_insights', "📊 AI 인사이트 생성 중...", self._generate_ai_insights, self._get_basic_insights),
+            ('mbti_analysis', "🧠 MBTI 분석 중...", self._analyze_mbti, self._get_basic_mbti),
+            ('personality_traits', "🎯 성격 특성 분석 중...", self._analyze_personality_traits, self._get_basic_personality),
+            ('recommendations', "💡 추천 생성 중...", self._generate_recommendations, self._get_basic_recommendations)
+        ]
+    
+    def _create_completion(self, section: str, **kwargs) -> str:
+        """chat.completions 호출 후 응답 텍스트 반환
+        
+        토큰 콜백이 설정되어 있으면 스트리밍으로 호출하여 (섹션, 토큰 조각)을 실시간 전달
+        """
+        if self._token_callback is None:
+            response = self.client.chat.completions.create(**kwargs)
+            return response.choices[0].message.content
+        
+        chunks = []
+        stream = self.client.chat.completions.create(stream=True, **kwargs)
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                chunks.append(delta)
+                try:
+                    self._token_callback(section, delta)
+                except Exception as e:
+                    print(f"⚠️ 토큰 스트림 전달 실패 ({section}): {e}")
+        return ''.join(chunks)
+    
+    def _notify_progress(self, progress_callback, key: str, section_result: Any):
+        """진행 콜백 호출 (콜백 오류가 분석을 중단시키지 않도록 보호)"""
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(key, section_result)
+        except Exception as e:
+            print(f"⚠️ 진행 상태 알림 실패 ({key}): {e}")
+    
+    def _notify_sections(self, progress_callback, result: Dict[str, Any]):
+        """한 번에 완성된 결과의 모든 섹션에 대해 진행 콜백 호출"""
+        for key, _, _, _ in self._get_analysis_sections():
+            self._notify_progress(progress_callback, key, result.get(key))
+    
+    def _run_sections_sequential(self, data_summary: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+        """분석 섹션을 순서대로 하나씩 실행"""
+        results = {}
+        for key, message, analyze, _ in self._get_analysis_sections():
+            print(message)
+            results[key] = analyze(data_summary)
+            self._notify_progress(progress_callback, key, results[key])
+        return results
+    
+    def _run_sections_concurrent(self, data_summary: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+        """분석 섹션을 스레드 풀에서 동시에 실행 (전체 소요 시간 ≈ 가장 느린 호출 1회)"""
+        sections = self._get_analysis_sections()
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {}
+            for key, message, analyze, fallback in sections:
+                print(message)
+                futures[executor.submit(analyze, data_summary)] = (key, fallback)
+            
+            for future in as_completed(futures):
+                key, fallback = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    # 섹션별 분석 함수가 처리하지 못한 예외는 해당 섹션만 기본값으로 대체
+                    print(f"❌ {key} 분석 실패, 기본값 사용: {e}")
+                    results[key] = fallback()
+                self._notify_progress(progress_callback, key, results[key])
+        
+        return results
+    
+    def _run_combined_analysis(self, data_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """데이터 요약을 한 번만 전송하고 네 섹션을 하나의 JSON 응답으로 받아 분석"""
+        print("🧩 통합 분석 중 (단일 호출)...")
+        
+        content = self._create_completion(
+            'combined',
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": """당신은 디지털 행동 패턴, MBTI, 성격 심리, 커리어 컨설팅 전문가입니다.
+                    사용자의 디지털 사용 데이터를 분석하여 요청된 JSON 형식으로만 응답해주세요.
+                    모든 설명은 한국어로 친근하고 이해하기 쉽게 작성해주세요."""
+                },
+                {
+                    "role": "user",
+                    "content": self._create_combined_prompt(data_summary)
+                }
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=2500,
+            temperature=0.6
+        )
+        
+        payload = json.loads(content)
+        return self._map_combined_response(payload)
+    
+    def _create_combined_prompt(self, data_summary: Dict[str, Any]) -> str:
+        """통합 분석용 프롬프트 생성 (데이터 요약은 한 번만 직렬화)"""
+        clean_data = convert_numpy_types(data_summary)
+        
+        return f"""
+        다음 사용자 데이터를 바탕으로 종합 인사이트, MBTI, 성격 특성, 개인화 추천을 한 번에 분석해주세요:
+        
+        {json.dumps(clean_data, ensure_ascii=False, separators=(',', ':'))}
+        
+        아래 구조의 JSON 객체 하나로만 응답해주세요. 점수는 모두 0-100 정수입니다.
+        {{
+          "ai_insights": {{"overview": "전반적인 디지털 사용 성향", "strengths": "주요 강점과 특징",
+                           "work_style": "업무 스타일과 선호도", "interests": "관심 분야와 전문성"}},
+          "mbti_analysis": {{
+            "E_I": {{"score": 0, "tendency": "E 또는 I", "description": "근거"}},
+            "S_N": {{"score": 0, "tendency": "S 또는 N", "description": "근거"}},
+            "T_F": {{"score": 0, "tendency": "T 또는 F", "description": "근거"}},
+            "J_P": {{"score": 0, "tendency": "J 또는 P", "description": "근거"}},
+            "predicted_type": "예: ESTJ", "confidence": 0
+          }},
+          "personality_traits": {{
+            "openness": {{"score": 0, "description": "근거"}}, "conscientiousness": {{"score": 0, "description": "근거"}},
+            "extraversion": {{"score": 0, "description": "근거"}}, "agreeableness": {{"score": 0, "description": "근거"}},
+            "neuroticism": {{"score": 0, "description": "근거"}}, "creativity": {{"score": 0, "description": "근거"}},
+            "tech_savviness": {{"score": 0, "description": "근거"}}
+          }},
+          "recommendations": {{
+            "productivity_tools": ["3-5개"], "learning_resources": ["3-5개"], "software_apps": ["3-5개"],
+            "work_style": ["3-5개"], "career_development": ["3-5개"]
+          }}
+        }}
+        """
+    
+    def _map_combined_response(self, payload: Any) -> Dict[str, Any]:
+        """통합 응답을 스키마로 검증한 뒤 기존 결과 구조로 변환 (잘못된 섹션만 기본값으로 대체)"""
+        if not isinstance(payload, dict):
+            raise ValueError("통합 분석 응답이 JSON 객체가 아닙니다.")
+        
+        fallbacks = {key: fallback for key, _, _, fallback in self._get_analysis_sections()}
+        sections = {}
+        
+        for key, schema in COMBINED_RESPONSE_SCHEMA.items():
+            section = payload.get(key)
+            errors = validate_schema(section, schema, key)
+            if not errors:
+                # 점수를 0-100 정수로 정규화한 결과도 같은 스키마로 다시 검증
+                section = self._normalize_combined_scores(key, section)
+                errors = validate_schema(section, schema, key)
+            if errors:
+                print(f"⚠️ 통합 응답의 {key} 섹션 검증 실패, 기본값 사용: {errors[:3]}")
+                section = fallbacks[key]()
+            sections[key] = section
+        
+        return sections
+    
+    @staticmethod
+    def _normalize_combined_scores(key: str, section: Dict[str, Any]) -> Dict[str, Any]:
+        """검증된 통합 응답 섹션의 점수를 0-100 정수로 정규화"""
+        def clamp(score):
+            return min(100, max(0, int(score)))
+        
+        if key == 'mbti_analysis':
+            section = dict(section)
+            for dimension in ('E_I', 'S_N', 'T_F', 'J_P'):
+                section[dimension] = dict(section[dimension], score=clamp(section[dimension]['score']))
+            section['confidence'] = clamp(section['confidence'])
+        elif key == 'personality_traits':
+            section = {name: dict(trait, score=clamp(trait['score'])) if isinstance(trait, dict) else trait
+                       for name, trait in section.items()}
+        return section
     
     def _generate_ai_insights(self, data_summary: Dict[str, Any]) -> Dict[str, str]:
         """AI를 사용하여 종합적인 인사이트 생성"""
         prompt = self._create_analysis_prompt(data_summary)
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            ai_response = self._create_completion(
+                'ai_insights',
+                model=self.model,
                 messages=[
                     {
                         "role": "system",
@@ -123,8 +410,6 @@ class AIPersonalityAnalyzer:
                 temperature=0.7
             )
             
-            ai_response = response.choices[0].message.content
-            
             # 응답을 구조화된 형태로 파싱
             return self._parse_ai_response(ai_response)
             
@@ -160,8 +445,9 @@ class AIPersonalityAnalyzer:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            mbti_response = self._create_completion(
+                'mbti_analysis',
+                model=self.model,
                 messages=[
                     {
                         "role": "system",
@@ -176,8 +462,6 @@ class AIPersonalityAnalyzer:
                 temperature=0.5
             )
             
-            mbti_response = response.choices[0].message.content
-            
             # JSON 파싱 시도
             try:
                 return json.loads(mbti_response)
@@ -214,8 +498,9 @@ class AIPersonalityAnalyzer:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            content = self._create_completion(
+                'personality_traits',
+                model=self.model,
                 messages=[
                     {
                         "role": "system",
@@ -230,7 +515,7 @@ class AIPersonalityAnalyzer:
                 temperature=0.6
             )
             
-            return self._parse_personality_response(response.choices[0].message.content)
+            return self._parse_personality_response(content)
             
         except Exception as e:
             print(f"성격 특성 분석 실패: {e}")
@@ -260,8 +545,9 @@ class AIPersonalityAnalyzer:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            content = self._create_completion(
+                'recommendations',
+                model=self.model,
                 messages=[
                     {
                         "role": "system",
@@ -276,7 +562,7 @@ class AIPersonalityAnalyzer:
                 temperature=0.7
             )
             
-            return self._parse_recommendations_response(response.choices[0].message.content)
+            return self._parse_recommendations_response(content)
             
         except Exception as e:
             print(f"추천 생성 실패: {e}")
@@ -571,12 +857,7 @@ class AIPersonalityAnalyzer:
     def _get_basic_analysis(self, data_summary: Dict[str, Any]) -> Dict[str, Any]:
         """AI 없이 기본 분석 수행"""
         return {
-            'ai_insights': {
-                'overview': '수집된 데이터를 바탕으로 기본 분석을 수행했습니다.',
-                'strengths': '다양한 디지털 도구를 활용하는 능력이 있습니다.',
-                'work_style': '체계적이고 효율적인 작업 방식을 선호합니다.',
-                'interests': '기술과 생산성에 관심이 많습니다.'
-            },
+            'ai_insights': self._get_basic_insights(),
             'mbti_analysis': self._get_basic_mbti(),
             'personality_traits': self._get_basic_personality(),
             'recommendations': self._get_basic_recommendations(),
@@ -584,6 +865,15 @@ class AIPersonalityAnalyzer:
             'ai_powered': False
         }
     
+    def _get_basic_insights(self) -> Dict[str, str]:
+        """기본 인사이트"""
+        return {
+            'overview': '수집된 데이터를 바탕으로 기본 분석을 수행했습니다.',
+            'strengths': '다양한 디지털 도구를 활용하는 능력이 있습니다.',
+            'work_style': '체계적이고 효율적인 작업 방식을 선호합니다.',
+            'interests': '기술과 생산성에 관심이 많습니다.'
+        }
+    
     def _get_basic_mbti(self) -> Dict[str, Any]:
         """기본 MBTI 분석"""
         return {
@@ -638,80 +928,8 @@ class AIPersonalityAnalyzer:
         }
 
 def prepare_data_for_ai_analysis(uploads_dir: str) -> Dict[str, Any]:
-    """수집된 데이터를 AI 분석용으로 준비"""
-    data_summary = {
-        'bookmark_categories': [],
-        'top_sites': [],
-        'software_categories': {},
-        'extensions': [],
-        'recent_files': [],
-        'network_stats': {},
-        'total_bookmarks': 0,
-        'total_visits': 0,
-        'total_programs': 0
-    }
-    
-    try:
-        # 북마크 데이터 처리
-        bookmark_files = [f for f in os.listdir(uploads_dir) if f.startswith('bookmarks_') and f.endswith('.csv')]
-        if bookmark_files:
-            latest_bookmark = max(bookmark_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_bookmarks = pd.read_csv(os.path.join(uploads_dir, latest_bookmark))
-            
-            if 'folder' in df_bookmarks.columns:
-                data_summary['bookmark_categories'] = df_bookmarks['folder'].value_counts().head(10).to_dict()
-            data_summary['total_bookmarks'] = len(df_bookmarks)
-        
-        # 히스토리 데이터 처리
-        history_files = [f for f in os.listdir(uploads_dir) if f.startswith('browser_history_') and f.endswith('.csv')]
-        if history_files:
-            latest_history = max(history_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_history = pd.read_csv(os.path.join(uploads_dir, latest_history))
-            
-            if 'domain' in df_history.columns:
-                data_summary['top_sites'] = df_history['domain'].value_counts().head(10).to_dict()
-            if 'visit_count' in df_history.columns:
-                data_summary['total_visits'] = df_history['visit_count'].sum()
-        
-        # 확장 프로그램 데이터 처리
-        extension_files = [f for f in os.listdir(uploads_dir) if f.startswith('chrome_extensions_') and f.endswith('.csv')]
-        if extension_files:
-            latest_extensions = max(extension_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_extensions = pd.read_csv(os.path.join(uploads_dir, latest_extensions))
-            
-            if 'category' in df_extensions.columns:
-                data_summary['extensions'] = df_extensions['category'].value_counts().to_dict()
-        
-        # 설치된 프로그램 데이터 처리
-        program_files = [f for f in os.listdir(uploads_dir) if f.startswith('installed_programs_') and f.endswith('.csv')]
-        if program_files:
-            latest_programs = max(program_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_programs = pd.read_csv(os.path.join(uploads_dir, latest_programs))
-            
-            if 'category' in df_programs.columns:
-                data_summary['software_categories'] = df_programs['category'].value_counts().to_dict()
-            data_summary['total_programs'] = len(df_programs)
-        
-        # 최근 파일 데이터 처리
-        recent_files = [f for f in os.listdir(uploads_dir) if f.startswith('recent_files_') and f.endswith('.csv')]
-        if recent_files:
-            latest_recent = max(recent_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_recent = pd.read_csv(os.path.join(uploads_dir, latest_recent))
-            
-            if 'category' in df_recent.columns:
-                data_summary['recent_files'] = df_recent['category'].value_counts().to_dict()
-        
-        # 네트워크 정보 처리
-        network_files = [f for f in os.listdir(uploads_dir) if f.startswith('network_info_') and f.endswith('.csv')]
-        if network_files:
-            latest_network = max(network_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_network = pd.read_csv(os.path.join(uploads_dir, latest_network))
-            
-            if 'category' in df_network.columns:
-                data_summary['network_stats'] = df_network['category'].value_counts().to_dict()
-    
-    except Exception as e:
-        print(f"데이터 준비 중 오류: {e}")
+    """수집된 데이터를 AI 분석용으로 준비 (집계는 data_aggregator에서 수행)"""
+    data_summary = DataAggregator(uploads_dir).ai_summary()
     
     # numpy 타입을 JSON 직렬화 가능한 타입으로 변환
     return convert_numpy_types(data_summary)
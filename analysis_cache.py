@@ -0,0 +1,118 @@
+"""
+AI 분석 결과 캐시 모듈
+정규화된 데이터 요약 + 모델 + 프롬프트 버전의 해시를 키로 분석 결과를 디스크에 보관
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+def make_cache_key(data_summary: Dict[str, Any], model: str, prompt_version: str) -> str:
+    """데이터 요약을 정렬된 JSON으로 직렬화하여 안정적인 SHA-256 키 생성"""
+    payload = json.dumps(
+        {'data_summary': data_summary, 'model': model, 'prompt_version': prompt_version},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class AnalysisResultCache:
+    """키별 JSON 파일로 저장하는 영속 캐시 (최대 개수 + TTL 기반 제거, 최근 사용 순 유지)"""
+
+    def __init__(self, cache_dir: str, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('AI_CACHE_MAX_ENTRIES', '50'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv('AI_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 반환 (없거나 만료되었으면 None)"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        # 최근 사용 시각 갱신 (제거 순서 결정에 사용)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get('result')
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """분석 결과 저장 후 만료/초과 항목 정리"""
+        path = self._entry_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': time.time(), 'result': result}, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"AI 분석 캐시 저장 실패: {e}")
+            self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def clear(self) -> int:
+        """캐시 전체 삭제, 삭제된 항목 수 반환"""
+        removed = 0
+        with self._lock:
+            for entry in self._list_entries():
+                if self._remove(entry[1]):
+                    removed += 1
+        return removed
+
+    def _list_entries(self):
+        """(마지막 사용 시각, 경로) 목록"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for dir_entry in it:
+                    if dir_entry.is_file() and dir_entry.name.endswith('.json'):
+                        try:
+                            entries.append((dir_entry.stat().st_mtime, dir_entry.path))
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self):
+        """TTL이 지난 항목과 최대 개수를 넘는 오래된 항목 제거"""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for last_used, path in self._list_entries():
+                if now - last_used > self.ttl_seconds:
+                    self._remove(path)
+                else:
+                    entries.append((last_used, path))
+
+            overflow = len(entries) - self.max_entries
+            if overflow > 0:
+                entries.sort()
+                for _, path in entries[:overflow]:
+                    self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
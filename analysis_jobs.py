@@ -0,0 +1,176 @@
+"""
+AI 분석 백그라운드 작업 관리 모듈
+분석 요청을 프로세스 내 작업 풀에 등록하고 진행 상태/결과를 조회할 수 있도록 관리
+"""
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+
+# 스트림 연결 하나가 받지 못하고 쌓아 둘 수 있는 토큰 이벤트 수 (넘치면 오래된 토큰부터 버림)
+TOKEN_BUFFER_SIZE = int(os.getenv('AI_TOKEN_BUFFER_SIZE', '1000'))
+
+class AnalysisJob:
+    """단일 AI 분석 작업의 상태"""
+
+    def __init__(self, total_sections: int = 4):
+        self.job_id = uuid.uuid4().hex
+        self.status = 'queued'  # queued → running → completed / failed
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.total_sections = total_sections
+        self.completed_sections = []
+        self.result = None
+        self.error = None
+        self.events = []  # SSE로 전달할 이벤트 로그 (id는 목록 인덱스 + 1, 토큰 이벤트는 저장하지 않음)
+        self._token_listeners = []  # 연결된 스트림별 토큰 버퍼
+        self._condition = threading.Condition()
+
+    def _add_event(self, event: str, data: Dict[str, Any]):
+        """이벤트 추가 후 대기 중인 스트림 깨우기 (호출자가 잠금을 보유해야 함)"""
+        self.events.append({'id': len(self.events) + 1, 'event': event, 'data': data})
+        self._condition.notify_all()
+
+    def section_completed(self, section: str, section_result: Any = None):
+        """분석 섹션 하나가 끝났을 때 호출 (AIPersonalityAnalyzer의 progress_callback)"""
+        with self._condition:
+            if section in self.completed_sections:
+                return
+            self.completed_sections.append(section)
+            self._add_event('section', {
+                'section': section,
+                'result': section_result,
+                'completed': len(self.completed_sections),
+                'total': self.total_sections
+            })
+
+    def token_received(self, section: str, delta: str):
+        """모델 응답 토큰 조각 수신 시 호출 (AIPersonalityAnalyzer의 token_callback)
+
+        토큰은 작업에 보관하지 않고 현재 연결된 스트림에만 전달
+        """
+        with self._condition:
+            if not self._token_listeners:
+                return
+            for listener in self._token_listeners:
+                listener.append({'event': 'token', 'data': {'section': section, 'delta': delta}})
+            self._condition.notify_all()
+
+    def subscribe_tokens(self) -> deque:
+        """토큰 이벤트를 받을 버퍼 등록 (스트림 종료 시 unsubscribe_tokens로 해제)"""
+        listener = deque(maxlen=TOKEN_BUFFER_SIZE)
+        with self._condition:
+            self._token_listeners.append(listener)
+        return listener
+
+    def unsubscribe_tokens(self, listener: deque):
+        with self._condition:
+            if listener in self._token_listeners:
+                self._token_listeners.remove(listener)
+
+    def _set_status(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with self._condition:
+            self.status = status
+            if status == 'running':
+                self.started_at = time.time()
+            else:
+                self.finished_at = time.time()
+                self.result = result
+                self.error = error
+            self._add_event('status', {'job_status': status})
+            if self.is_finished:
+                self._add_event('complete', self.to_dict())
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업이 끝날 때까지 대기, 끝났으면 True"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.is_finished, timeout)
+
+    def wait_for_events(self, after: int, timeout: Optional[float] = None, tokens: Optional[deque] = None):
+        """after번째 이후 이벤트(또는 tokens 버퍼의 토큰)가 생길 때까지 대기하고
+
+        (새 토큰 목록, 새 이벤트 목록, 작업 종료 여부) 반환
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.events) > after or self.is_finished or bool(tokens), timeout)
+            new_tokens = []
+            if tokens:
+                new_tokens = list(tokens)
+                tokens.clear()
+            return new_tokens, self.events[after:], self.is_finished
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 조회 API 응답용 딕셔너리"""
+        with self._condition:
+            data = {
+                'job_id': self.job_id,
+                'job_status': self.status,
+                'progress': {
+                    'completed_sections': list(self.completed_sections),
+                    'completed': len(self.completed_sections),
+                    'total': self.total_sections
+                },
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+            if self.status == 'completed':
+                data['status'] = 'success'
+                data.update(self.result or {})
+            elif self.status == 'failed':
+                data['status'] = 'error'
+                data['message'] = self.error
+            else:
+                data['status'] = 'pending'
+            return data
+
+class AnalysisJobManager:
+    """동시 실행 수가 제한된 스레드 풀에서 분석 작업을 실행하고 완료된 작업은 일정 시간 후 정리"""
+
+    def __init__(self, max_workers: Optional[int] = None, job_ttl_seconds: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv('AI_JOB_WORKERS', '2'))
+        self.job_ttl_seconds = job_ttl_seconds if job_ttl_seconds is not None else int(os.getenv('AI_JOB_TTL_SECONDS', '3600'))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ai-analysis')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Dict[str, Any]], *args, **kwargs) -> AnalysisJob:
+        """작업 등록 후 즉시 반환. func(job, *args, **kwargs)의 반환값이 작업 결과가 됨"""
+        self._cleanup()
+        job = AnalysisJob()
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: AnalysisJob, func, args, kwargs):
+        job._set_status('running')
+        try:
+            result = func(job, *args, **kwargs)
+            job._set_status('completed', result=result)
+        except Exception as e:
+            print(f"❌ AI 분석 작업 실패 ({job.job_id}): {e}")
+            import traceback
+            traceback.print_exc()
+            job._set_status('failed', error=f'AI 분석 중 오류가 발생했습니다: {str(e)}')
+
+    def _cleanup(self):
+        """완료 후 TTL이 지난 작업 제거"""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.is_finished and now - job.finished_at > self.job_ttl_seconds]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -1,10 +1,12 @@
-from flask import Flask, render_template_string, jsonify, request, redirect, url_for, session, send_file
+from flask import Flask, render_template_string, jsonify, request, redirect, url_for, session, send_file, Response
 import json
 from datetime import datetime, timedelta
 import os
 import pandas as pd
 import io
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from generate_interactive_html import generate_interactive_analysis_html
 
 # 환경 변수 로드
@@ -18,7 +20,7 @@ except ImportError:
 # 환경 감지 및 데이터 수집 모듈 import
 try:
     from data_collector import (ChromeBookmarkCollector, SystemInfoCollector, BrowserHistoryCollector, 
-                               RecentFilesCollector, NetworkInfoCollector, is_aws_environment)
+                               RecentFilesCollector, NetworkInfoCollector, is_aws_environment, cpu_sampler)
     DATA_COLLECTORS_AVAILABLE = True
     print("✅ 데이터 수집 모듈 로드 성공")
 except ImportError as e:
@@ -39,7 +41,7 @@ except ImportError as e:
 
 # AI 분석 모듈 import
 try:
-    from ai_analyzer import AIPersonalityAnalyzer, prepare_data_for_ai_analysis
+    from ai_analyzer import AIPersonalityAnalyzer, prepare_data_for_ai_analysis, get_analysis_cache_key
     AI_ANALYZER_AVAILABLE = True
     print("✅ AI 분석 모듈 로드 성공")
 except ImportError as e:
@@ -55,6 +57,55 @@ UPLOAD_FOLDER = 'uploads'
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# 증분 히스토리 수집 상태 (워터마크 + 누적 데이터셋)
+HISTORY_STATE_PATH = os.path.join(UPLOAD_FOLDER, 'history_state.db')
+
+# AI 분석 결과 캐시 (수집 데이터가 바뀌지 않았으면 OpenAI 호출 없이 재사용)
+from analysis_cache import AnalysisResultCache
+ai_result_cache = AnalysisResultCache(os.path.join(UPLOAD_FOLDER, 'ai_cache'))
+
+# AI 분석 작업 풀 (요청 워커를 붙잡지 않도록 분석은 백그라운드에서 실행)
+from analysis_jobs import AnalysisJobManager
+ai_job_manager = AnalysisJobManager()
+
+# 시스템 정보 수집 요청이 1초씩 대기하지 않도록 CPU 사용률 샘플러를 미리 시작
+if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+    cpu_sampler.start()
+
+# 수집 데이터셋 카탈로그 (종류별 최신 파일을 디렉토리 스캔 없이 조회)
+from dataset_catalog import get_catalog, dataframe_schema
+from dataset_store import write_dataset, dataframe_cache, dataset_file_group, DATASET_EXTENSIONS
+from data_aggregator import DataAggregator, summarize_dataset, validate_timezone
+dataset_catalog = get_catalog(UPLOAD_FOLDER)
+
+# 파일 관리 API에서 다루는 확장자 (데이터셋 + AI 분석 결과)
+MANAGED_FILE_EXTENSIONS = DATASET_EXTENSIONS + ('.json',)
+
+def managed_file_groups():
+    """업로드 폴더의 관리 대상 파일을 데이터셋 단위로 묶은 목록 (기본 파일과 CSV 사본은 한 묶음, 기본 파일이 앞)"""
+    groups = {}
+    if os.path.exists(UPLOAD_FOLDER):
+        for filename in os.listdir(UPLOAD_FOLDER):
+            stem, ext = os.path.splitext(filename)
+            if ext in DATASET_EXTENSIONS:
+                groups.setdefault(stem, []).append(filename)
+            elif filename.endswith(MANAGED_FILE_EXTENSIONS):
+                groups.setdefault(filename, []).append(filename)
+    order = {ext: rank for rank, ext in enumerate(MANAGED_FILE_EXTENSIONS)}
+    return [sorted(files, key=lambda name: order[os.path.splitext(name)[1]]) for files in groups.values()]
+
+def save_dataset(kind, records, timestamp=None, visit_activity=None):
+    """수집 결과를 데이터셋 형식(설정에 따라 CSV 사본 포함)으로 저장하고 요약 스냅샷과 함께 카탈로그에 등록, 저장 경로 반환"""
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    df = pd.DataFrame(records)
+    if 'category' in df.columns:
+        # 반복되는 카테고리 값은 범주형으로 저장하여 집계/그룹화 비용 절감
+        df['category'] = df['category'].astype('category')
+    dataset_path = write_dataset(df, f"{UPLOAD_FOLDER}/{kind}_{timestamp}")
+    summary = summarize_dataset(kind, df, pd.DataFrame(visit_activity) if visit_activity else None)
+    dataset_catalog.register(kind, dataset_path, row_count=len(df), schema=dataframe_schema(df), summary=summary)
+    return dataset_path
+
 # 동의서 템플릿
 CONSENT_TEMPLATE = '''
 <!DOCTYPE html>
@@ -649,6 +700,14 @@ DATA_COLLECTION_TEMPLATE = '''
             <div id="clearStatus"></div>
         </div>
         
+        <!-- 전체 수집 버튼 -->
+        <div style="text-align: center; margin: 20px 0;">
+            <button class="btn" onclick="collectAll()" id="collectAllBtn" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;">
+                🚀 전체 수집 (동시 실행)
+            </button>
+            <div id="collectAllStatus"></div>
+        </div>
+        
         <div class="collection-grid">
             <!-- 북마크 수집 섹션 -->
             <div class="collection-section">
@@ -1073,7 +1132,7 @@ DATA_COLLECTION_TEMPLATE = '''
                                  <div class="file-meta" style="font-size: 12px; color: #6c757d;">크기: ${size} KB | 수정일: ${date}</div>
                              </div>
                              <div class="file-actions" style="display: flex; gap: 10px;">
-                                 <button class="btn" onclick="downloadFile('${file.name}')" style="padding: 8px 16px; font-size: 12px; background: linear-gradient(135deg, #28a745 0%, #20c997 100%);">📥 다운로드</button>
+                                 <button class="btn" onclick="downloadFile('${file.csv_copy || file.name}')" style="padding: 8px 16px; font-size: 12px; background: linear-gradient(135deg, #28a745 0%, #20c997 100%);">📥 다운로드</button>
                                  <button class="btn" onclick="deleteFile('${file.name}')" style="padding: 8px 16px; font-size: 12px; background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);">🗑️ 삭제</button>
                              </div>
                          </div>
@@ -1199,6 +1258,74 @@ DATA_COLLECTION_TEMPLATE = '''
              }
          }
 
+         // 전체 수집 함수 (서버에서 모든 수집기를 동시에 실행)
+         const COLLECTOR_ELEMENTS = {
+             bookmarks: 'bookmark',
+             browser_history: 'history',
+             system_info: 'system',
+             chrome_extensions: 'extensions',
+             recent_files: 'recentFiles',
+             network_info: 'network',
+             installed_programs: 'programs'
+         };
+
+         async function collectAll() {
+             const btn = document.getElementById('collectAllBtn');
+             const status = document.getElementById('collectAllStatus');
+             
+             btn.disabled = true;
+             status.innerHTML = '<div class="status info">모든 데이터를 동시에 수집하는 중...</div>';
+             for (const prefix of Object.values(COLLECTOR_ELEMENTS)) {
+                 document.getElementById(prefix + 'Btn').disabled = true;
+                 document.getElementById(prefix + 'Progress').style.width = '50%';
+             }
+
+             try {
+                 const response = await fetch('/collect_all', {
+                     method: 'POST',
+                     headers: {
+                         'Content-Type': 'application/json',
+                     },
+                     body: JSON.stringify({
+                         options: {
+                             bookmarks: {
+                                 start_date: document.getElementById('startDate').value,
+                                 end_date: document.getElementById('endDate').value,
+                                 include_folders: document.getElementById('includeFolders').checked
+                             },
+                             browser_history: {
+                                 days_back: parseInt(document.getElementById('historyDays').value)
+                             },
+                             recent_files: {
+                                 days_back: parseInt(document.getElementById('recentFileDays').value)
+                             }
+                         }
+                     })
+                 });
+
+                 const result = await response.json();
+                 
+                 for (const [name, item] of Object.entries(result.results || {})) {
+                     const prefix = COLLECTOR_ELEMENTS[name];
+                     document.getElementById(prefix + 'Progress').style.width = '100%';
+                     document.getElementById(prefix + 'Status').innerHTML = item.status === 'success'
+                         ? `<div class="status success">${item.message}<br><small>데이터 소스: ${item.data_source} · ${item.elapsed_seconds}초</small></div>`
+                         : `<div class="status error">오류: ${item.message}</div>`;
+                 }
+                 
+                 const statusClass = result.status === 'success' ? 'success' : (result.status === 'partial' ? 'info' : 'error');
+                 status.innerHTML = `<div class="status ${statusClass}">${result.message}</div>`;
+                 refreshFileList();
+             } catch (error) {
+                 status.innerHTML = `<div class="status error">네트워크 오류: ${error.message}</div>`;
+             } finally {
+                 btn.disabled = false;
+                 for (const prefix of Object.values(COLLECTOR_ELEMENTS)) {
+                     document.getElementById(prefix + 'Btn').disabled = false;
+                 }
+             }
+         }
+
          // 초기화 함수
          async function clearAllFiles() {
              if (!confirm('⚠️ 모든 수집된 파일을 삭제하시겠습니까?\\n\\n이 작업은 되돌릴 수 없습니다!')) {
@@ -1291,60 +1418,328 @@ def data_collection():
     
     return render_template_string(DATA_COLLECTION_TEMPLATE)
 
+# 데이터 수집 함수들 (개별 수집 API와 /collect_all에서 공용으로 사용)
+def _collect_bookmarks(data):
+    """Chrome 북마크 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    start_date = data.get('start_date')
+    end_date = data.get('end_date')
+    include_folders = data.get('include_folders', True)
+    
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 Chrome 북마크 수집
+        try:
+            collector = ChromeBookmarkCollector()
+            bookmarks = collector.extract_bookmarks(start_date, end_date, include_folders)
+            data_source = "실제 Chrome 북마크"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = ChromeBookmarkCollector()
+            bookmarks = collector._get_sample_bookmarks()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = ChromeBookmarkCollector()
+        bookmarks = collector._get_sample_bookmarks()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 날짜 필터링 (샘플 데이터의 경우)
+    if start_date or end_date:
+        start_bound = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_bound = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+        filtered_bookmarks = []
+        for bookmark in bookmarks:
+            bookmark_date = datetime.fromisoformat(bookmark['date_added'].replace('Z', '+00:00')).replace(tzinfo=None)
+    
+            if start_bound and bookmark_date < start_bound:
+                continue
+            if end_bound and bookmark_date > end_bound:
+                continue
+    
+            filtered_bookmarks.append(bookmark)
+        bookmarks = filtered_bookmarks
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('bookmarks', bookmarks)
+    
+    return {
+        'status': 'success',
+        'message': f'북마크 {len(bookmarks)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': bookmarks[:5],
+        'data_source': data_source,
+        'total_count': len(bookmarks)
+    }
+
+
+def _collect_browser_history(data):
+    """브라우저 히스토리 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    days_back = data.get('days_back', 30)
+    incremental = data.get('incremental', True)  # 이전 수집 이후 변경분만 읽어 병합
+    
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 Chrome 히스토리 수집
+        try:
+            collector = BrowserHistoryCollector()
+            # 히스토리와 방문 1회 단위 시간대별 집계(SQLite에서 집계)를 프로필별 DB 한 번 열기로 함께 수집
+            history, visit_activity = collector.get_history_with_activity(
+                days_back, state_path=HISTORY_STATE_PATH if incremental else None
+            )
+            data_source = "실제 Chrome 히스토리"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = BrowserHistoryCollector()
+            history = collector._get_sample_history()
+            visit_activity = []
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = BrowserHistoryCollector()
+        history = collector._get_sample_history()
+        visit_activity = []
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 날짜 필터링 (지정된 일수만큼)
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    filtered_history = []
+    for item in history:
+        last_visit = datetime.fromisoformat(item['last_visit'].replace('Z', '+00:00')).replace(tzinfo=None)
+        if last_visit >= cutoff_date:
+            filtered_history.append(item)
+    
+    history = filtered_history
+    
+    # 데이터셋으로 저장 (방문 활동 집계는 같은 타임스탬프로 함께 저장)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if visit_activity:
+        save_dataset('visit_activity', visit_activity, timestamp)
+    
+    dataset_path = save_dataset('browser_history', history, timestamp, visit_activity)
+    
+    return {
+        'status': 'success',
+        'message': f'최근 {days_back}일간의 히스토리 {len(history)}개가 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': history[:5],
+        'data_source': data_source,
+        'total_count': len(history)
+    }
+
+
+class CollectorOptionError(ValueError):
+    """수집 요청 옵션이 올바르지 않음 (400 응답)"""
+
+def _system_info_options(data):
+    """시스템 정보 수집 옵션 검증 후 (상위 프로세스 수, 정렬 기준) 반환"""
+    top_processes = data.get('top_processes')  # 포함할 상위 프로세스 수
+    process_sort = data.get('process_sort', 'cpu')  # 상위 프로세스 정렬 기준 ('cpu' 또는 'memory')
+    
+    if top_processes is not None:
+        try:
+            if isinstance(top_processes, bool) or float(top_processes) != int(top_processes):
+                raise ValueError
+            top_processes = int(top_processes)
+        except (TypeError, ValueError):
+            raise CollectorOptionError(f'top_processes는 0 이상의 정수여야 합니다: {top_processes!r}')
+        if top_processes < 0:
+            raise CollectorOptionError(f'top_processes는 0 이상의 정수여야 합니다: {top_processes!r}')
+    if process_sort not in ('cpu', 'memory'):
+        raise CollectorOptionError(f"process_sort는 'cpu' 또는 'memory'여야 합니다: {process_sort!r}")
+    return top_processes, process_sort
+
+def _collect_system_info(data):
+    """시스템 정보 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    top_processes, process_sort = _system_info_options(data)
+    
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 시스템 정보 수집
+        try:
+            collector = SystemInfoCollector()
+            system_info = collector.get_system_info(top_processes, process_sort)
+            data_source = "실제 시스템 정보"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = SystemInfoCollector()
+            system_info = collector._get_sample_system_info()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = SystemInfoCollector()
+        system_info = collector._get_sample_system_info()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('system_info', system_info)
+    
+    return {
+        'status': 'success',
+        'message': f'시스템 정보 {len(system_info)}개 항목이 성공적으로 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': system_info[:5],
+        'data_source': data_source,
+        'total_count': len(system_info)
+    }
+
+
+def _collect_chrome_extensions(data):
+    """Chrome 확장 프로그램 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 Chrome 확장 프로그램 수집
+        try:
+            collector = ChromeBookmarkCollector()
+            extensions = collector.get_chrome_extensions()
+            data_source = "실제 Chrome 확장 프로그램"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = ChromeBookmarkCollector()
+            extensions = collector._get_sample_extensions()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = ChromeBookmarkCollector()
+        extensions = collector._get_sample_extensions()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('chrome_extensions', extensions)
+    
+    return {
+        'status': 'success',
+        'message': f'Chrome 확장 프로그램 {len(extensions)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': extensions[:5],
+        'data_source': data_source,
+        'total_count': len(extensions)
+    }
+
+
+def _collect_recent_files(data):
+    """최근 사용한 파일 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    days_back = data.get('days_back', 7)
+    
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 최근 파일 수집
+        try:
+            collector = RecentFilesCollector()
+            recent_files = collector.get_recent_files(days_back)
+            data_source = "실제 최근 사용 파일"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = RecentFilesCollector()
+            recent_files = collector._get_sample_recent_files()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = RecentFilesCollector()
+        recent_files = collector._get_sample_recent_files()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('recent_files', recent_files)
+    
+    return {
+        'status': 'success',
+        'message': f'최근 {days_back}일간의 파일 {len(recent_files)}개가 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': recent_files[:5],
+        'data_source': data_source,
+        'total_count': len(recent_files)
+    }
+
+
+def _collect_network_info(data):
+    """네트워크 정보 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 네트워크 정보 수집
+        try:
+            collector = NetworkInfoCollector()
+            network_info = collector.get_network_info()
+            data_source = "실제 네트워크 정보"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = NetworkInfoCollector()
+            network_info = collector._get_sample_network_info()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = NetworkInfoCollector()
+        network_info = collector._get_sample_network_info()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('network_info', network_info)
+    
+    return {
+        'status': 'success',
+        'message': f'네트워크 정보 {len(network_info)}개 항목이 성공적으로 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': network_info[:5],
+        'data_source': data_source,
+        'total_count': len(network_info)
+    }
+
+
+def _collect_installed_programs(data):
+    """설치된 프로그램 목록 수집 - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터), 응답 데이터 반환"""
+    # 환경에 따라 데이터 수집 방식 결정
+    if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
+        # 로컬 환경: 실제 설치된 프로그램 수집
+        try:
+            collector = SystemInfoCollector()
+            programs = collector.get_installed_programs()
+            data_source = "실제 설치된 프로그램"
+        except Exception as e:
+            print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
+            collector = SystemInfoCollector()
+            programs = collector._get_sample_installed_programs()
+            data_source = "샘플 데이터 (실제 수집 실패)"
+    else:
+        # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
+        collector = SystemInfoCollector()
+        programs = collector._get_sample_installed_programs()
+        data_source = "샘플 데이터 (AWS 환경)"
+    
+    # 데이터셋으로 저장
+    dataset_path = save_dataset('installed_programs', programs)
+    
+    return {
+        'status': 'success',
+        'message': f'설치된 프로그램 {len(programs)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
+        'filename': os.path.basename(dataset_path),
+        'data_preview': programs[:5],
+        'data_source': data_source,
+        'total_count': len(programs)
+    }
+
+# 수집기 이름 → 옵션 검증 함수 (/collect_all은 실행 전에 모든 옵션을 검증)
+COLLECTOR_OPTION_VALIDATORS = {
+    'system_info': _system_info_options
+}
+
+# 수집기 이름 → 수집 함수 (/collect_all 실행 대상)
+COLLECTORS = {
+    'bookmarks': _collect_bookmarks,
+    'browser_history': _collect_browser_history,
+    'system_info': _collect_system_info,
+    'chrome_extensions': _collect_chrome_extensions,
+    'recent_files': _collect_recent_files,
+    'network_info': _collect_network_info,
+    'installed_programs': _collect_installed_programs
+}
+
+# /collect_all 동시 실행 수집기 수
+COLLECT_ALL_WORKERS = int(os.getenv('COLLECT_ALL_WORKERS', '4'))
+
 @application.route('/collect_bookmarks', methods=['POST'])
 def collect_bookmarks():
     """북마크 수집 API - 하이브리드 방식 (로컬: 실제 데이터, AWS: 샘플 데이터)"""
     try:
-        data = request.get_json()
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
-        include_folders = data.get('include_folders', True)
-        
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 Chrome 북마크 수집
-            try:
-                collector = ChromeBookmarkCollector()
-                bookmarks = collector.extract_bookmarks(start_date, end_date, include_folders)
-                data_source = "실제 Chrome 북마크"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = ChromeBookmarkCollector()
-                bookmarks = collector._get_sample_bookmarks()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = ChromeBookmarkCollector()
-            bookmarks = collector._get_sample_bookmarks()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # 날짜 필터링 (샘플 데이터의 경우)
-        if start_date or end_date:
-            filtered_bookmarks = []
-            for bookmark in bookmarks:
-                bookmark_date = datetime.fromisoformat(bookmark['date_added'].replace('Z', '+00:00')).replace(tzinfo=None)
-                
-                if start_date and bookmark_date < datetime.strptime(start_date, '%Y-%m-%d'):
-                    continue
-                if end_date and bookmark_date > datetime.strptime(end_date, '%Y-%m-%d'):
-                    continue
-                    
-                filtered_bookmarks.append(bookmark)
-            bookmarks = filtered_bookmarks
-        
-        # CSV로 저장
-        df = pd.DataFrame(bookmarks)
-        csv_filename = f"{UPLOAD_FOLDER}/bookmarks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'북마크 {len(bookmarks)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': bookmarks[:5],
-            'data_source': data_source,
-            'total_count': len(bookmarks)
-        })
+        return jsonify(_collect_bookmarks(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1355,50 +1750,7 @@ def collect_bookmarks():
 def collect_browser_history():
     """브라우저 히스토리 수집 API - 하이브리드 방식"""
     try:
-        data = request.get_json()
-        days_back = data.get('days_back', 30)
-        
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 Chrome 히스토리 수집
-            try:
-                collector = BrowserHistoryCollector()
-                history = collector.get_browser_history(days_back)
-                data_source = "실제 Chrome 히스토리"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = BrowserHistoryCollector()
-                history = collector._get_sample_history()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = BrowserHistoryCollector()
-            history = collector._get_sample_history()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # 날짜 필터링 (지정된 일수만큼)
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        filtered_history = []
-        for item in history:
-            last_visit = datetime.fromisoformat(item['last_visit'].replace('Z', '+00:00')).replace(tzinfo=None)
-            if last_visit >= cutoff_date:
-                filtered_history.append(item)
-        
-        history = filtered_history
-        
-        # CSV로 저장
-        df = pd.DataFrame(history)
-        csv_filename = f"{UPLOAD_FOLDER}/browser_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'최근 {days_back}일간의 히스토리 {len(history)}개가 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': history[:5],
-            'data_source': data_source,
-            'total_count': len(history)
-        })
+        return jsonify(_collect_browser_history(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1409,37 +1761,12 @@ def collect_browser_history():
 def collect_system_info():
     """시스템 정보 수집 API - 하이브리드 방식"""
     try:
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 시스템 정보 수집
-            try:
-                collector = SystemInfoCollector()
-                system_info = collector.get_system_info()
-                data_source = "실제 시스템 정보"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = SystemInfoCollector()
-                system_info = collector._get_sample_system_info()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = SystemInfoCollector()
-            system_info = collector._get_sample_system_info()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # CSV로 저장
-        df = pd.DataFrame(system_info)
-        csv_filename = f"{UPLOAD_FOLDER}/system_info_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
+        return jsonify(_collect_system_info(request.get_json(silent=True) or {}))
+    except CollectorOptionError as e:
         return jsonify({
-            'status': 'success',
-            'message': f'시스템 정보 {len(system_info)}개 항목이 성공적으로 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': system_info[:5],
-            'data_source': data_source,
-            'total_count': len(system_info)
-        })
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1450,37 +1777,7 @@ def collect_system_info():
 def collect_chrome_extensions():
     """Chrome 확장 프로그램 수집 API"""
     try:
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 Chrome 확장 프로그램 수집
-            try:
-                collector = ChromeBookmarkCollector()
-                extensions = collector.get_chrome_extensions()
-                data_source = "실제 Chrome 확장 프로그램"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = ChromeBookmarkCollector()
-                extensions = collector._get_sample_extensions()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = ChromeBookmarkCollector()
-            extensions = collector._get_sample_extensions()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # CSV로 저장
-        df = pd.DataFrame(extensions)
-        csv_filename = f"{UPLOAD_FOLDER}/chrome_extensions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'Chrome 확장 프로그램 {len(extensions)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': extensions[:5],
-            'data_source': data_source,
-            'total_count': len(extensions)
-        })
+        return jsonify(_collect_chrome_extensions(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1491,40 +1788,7 @@ def collect_chrome_extensions():
 def collect_recent_files():
     """최근 사용한 파일 수집 API"""
     try:
-        data = request.get_json()
-        days_back = data.get('days_back', 7)
-        
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 최근 파일 수집
-            try:
-                collector = RecentFilesCollector()
-                recent_files = collector.get_recent_files(days_back)
-                data_source = "실제 최근 사용 파일"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = RecentFilesCollector()
-                recent_files = collector._get_sample_recent_files()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = RecentFilesCollector()
-            recent_files = collector._get_sample_recent_files()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # CSV로 저장
-        df = pd.DataFrame(recent_files)
-        csv_filename = f"{UPLOAD_FOLDER}/recent_files_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'최근 {days_back}일간의 파일 {len(recent_files)}개가 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': recent_files[:5],
-            'data_source': data_source,
-            'total_count': len(recent_files)
-        })
+        return jsonify(_collect_recent_files(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1535,37 +1799,7 @@ def collect_recent_files():
 def collect_network_info():
     """네트워크 정보 수집 API"""
     try:
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 네트워크 정보 수집
-            try:
-                collector = NetworkInfoCollector()
-                network_info = collector.get_network_info()
-                data_source = "실제 네트워크 정보"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = NetworkInfoCollector()
-                network_info = collector._get_sample_network_info()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = NetworkInfoCollector()
-            network_info = collector._get_sample_network_info()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # CSV로 저장
-        df = pd.DataFrame(network_info)
-        csv_filename = f"{UPLOAD_FOLDER}/network_info_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'네트워크 정보 {len(network_info)}개 항목이 성공적으로 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': network_info[:5],
-            'data_source': data_source,
-            'total_count': len(network_info)
-        })
+        return jsonify(_collect_network_info(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1576,43 +1810,65 @@ def collect_network_info():
 def collect_installed_programs():
     """설치된 프로그램 목록 수집 API"""
     try:
-        # 환경에 따라 데이터 수집 방식 결정
-        if DATA_COLLECTORS_AVAILABLE and not is_aws_environment():
-            # 로컬 환경: 실제 설치된 프로그램 수집
-            try:
-                collector = SystemInfoCollector()
-                programs = collector.get_installed_programs()
-                data_source = "실제 설치된 프로그램"
-            except Exception as e:
-                print(f"실제 데이터 수집 실패, 샘플 데이터 사용: {e}")
-                collector = SystemInfoCollector()
-                programs = collector._get_sample_installed_programs()
-                data_source = "샘플 데이터 (실제 수집 실패)"
-        else:
-            # AWS 환경 또는 모듈 없음: 샘플 데이터 사용
-            collector = SystemInfoCollector()
-            programs = collector._get_sample_installed_programs()
-            data_source = "샘플 데이터 (AWS 환경)"
-        
-        # CSV로 저장
-        df = pd.DataFrame(programs)
-        csv_filename = f"{UPLOAD_FOLDER}/installed_programs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'설치된 프로그램 {len(programs)}개가 성공적으로 수집되었습니다. (출처: {data_source})',
-            'filename': os.path.basename(csv_filename),
-            'data_preview': programs[:5],
-            'data_source': data_source,
-            'total_count': len(programs)
-        })
+        return jsonify(_collect_installed_programs(request.get_json(silent=True) or {}))
     except Exception as e:
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+@application.route('/collect_all', methods=['POST'])
+def collect_all():
+    """모든 수집기를 스레드 풀에서 동시에 실행하고 수집기별 상태와 소요 시간 반환
+
+    요청 본문 예: {"collectors": ["bookmarks", "browser_history"], "options": {"browser_history": {"days_back": 7}}}
+    collectors를 생략하면 전체 수집기를 실행
+    """
+    data = request.get_json(silent=True) or {}
+    names = data.get('collectors') or list(COLLECTORS)
+    options = data.get('options') or {}
+    
+    unknown = [name for name in names if name not in COLLECTORS]
+    if unknown:
+        return jsonify({
+            'status': 'error',
+            'message': f'알 수 없는 수집기: {", ".join(unknown)}'
+        }), 400
+    
+    try:
+        for name in names:
+            if name in COLLECTOR_OPTION_VALIDATORS:
+                COLLECTOR_OPTION_VALIDATORS[name](options.get(name) or {})
+    except CollectorOptionError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    
+    def run(name):
+        started = time.perf_counter()
+        try:
+            result = COLLECTORS[name](options.get(name) or {})
+            result.pop('data_preview', None)
+        except Exception as e:
+            print(f"❌ {name} 수집 실패: {e}")
+            result = {'status': 'error', 'message': str(e)}
+        result['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        return name, result
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(COLLECT_ALL_WORKERS, len(names)) or 1, thread_name_prefix='collector') as executor:
+        results = dict(executor.map(run, names))
+    elapsed = round(time.perf_counter() - started, 3)
+    
+    success_count = sum(1 for result in results.values() if result['status'] == 'success')
+    return jsonify({
+        'status': 'success' if success_count == len(names) else ('partial' if success_count else 'error'),
+        'message': f'{len(names)}개 수집기 중 {success_count}개 수집 완료 ({elapsed}초)',
+        'elapsed_seconds': elapsed,
+        'results': results
+    })
+
 @application.route('/clear_all_files', methods=['POST'])
 def clear_all_files():
     """모든 수집된 파일 삭제 (초기화)"""
@@ -1623,17 +1879,30 @@ def clear_all_files():
         deleted_count = 0
         error_count = 0
         
-        if os.path.exists(UPLOAD_FOLDER):
-            for filename in os.listdir(UPLOAD_FOLDER):
-                if filename.endswith(('.csv', '.json')):
-                    try:
-                        file_path = os.path.join(UPLOAD_FOLDER, filename)
-                        os.remove(file_path)
-                        deleted_count += 1
-                        print(f"✅ 파일 삭제: {filename}")
-                    except Exception as e:
-                        error_count += 1
-                        print(f"❌ 파일 삭제 실패: {filename} - {e}")
+        # 기본 파일과 CSV 사본은 파일 목록과 같이 하나로 셈
+        for filenames in managed_file_groups():
+            failed = False
+            for filename in filenames:
+                try:
+                    os.remove(os.path.join(UPLOAD_FOLDER, filename))
+                    print(f"✅ 파일 삭제: {filename}")
+                except Exception as e:
+                    failed = True
+                    print(f"❌ 파일 삭제 실패: {filename} - {e}")
+            if failed:
+                error_count += 1
+            else:
+                deleted_count += 1
+        
+        # 삭제된 데이터로 만든 AI 분석 캐시, 데이터셋 카탈로그/캐시, 증분 히스토리 상태도 함께 초기화
+        ai_result_cache.clear()
+        dataset_catalog.clear()
+        dataframe_cache.clear()
+        if os.path.exists(HISTORY_STATE_PATH):
+            try:
+                os.remove(HISTORY_STATE_PATH)
+            except Exception as e:
+                print(f"❌ 히스토리 상태 삭제 실패: {e}")
         
         if deleted_count > 0:
             message = f"🗑️ 초기화 완료! {deleted_count}개의 파일이 삭제되었습니다."
@@ -1658,17 +1927,17 @@ def clear_all_files():
 # 파일 관리 API들
 @application.route('/list_files')
 def list_files():
-    """수집된 파일 목록 반환"""
+    """수집된 파일 목록 반환 (데이터셋은 기본 파일 하나로 표시하고 CSV 사본은 csv_copy로 함께 전달)"""
     files = []
-    if os.path.exists(UPLOAD_FOLDER):
-        for filename in os.listdir(UPLOAD_FOLDER):
-            if filename.endswith(('.csv', '.json')):
-                file_path = os.path.join(UPLOAD_FOLDER, filename)
-                files.append({
-                    'name': filename,
-                    'size': os.path.getsize(file_path),
-                    'modified': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                })
+    for filenames in managed_file_groups():
+        file_path = os.path.join(UPLOAD_FOLDER, filenames[0])
+        csv_copies = [filename for filename in filenames[1:] if filename.endswith('.csv')]
+        files.append({
+            'name': filenames[0],
+            'size': sum(os.path.getsize(os.path.join(UPLOAD_FOLDER, filename)) for filename in filenames),
+            'modified': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
+            'csv_copy': csv_copies[0] if csv_copies else None
+        })
     return jsonify(files)
 
 @application.route('/download/<filename>')
@@ -1676,7 +1945,7 @@ def download_file(filename):
     """파일 다운로드"""
     try:
         file_path = os.path.join(UPLOAD_FOLDER, filename)
-        if os.path.exists(file_path) and filename.endswith(('.csv', '.json', '.html')):
+        if os.path.exists(file_path) and filename.endswith(MANAGED_FILE_EXTENSIONS + ('.html',)):
             return send_file(file_path, as_attachment=True, download_name=filename)
         else:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
@@ -1685,12 +1954,18 @@ def download_file(filename):
 
 @application.route('/delete/<filename>', methods=['DELETE'])
 def delete_file_route(filename):
-    """파일 삭제"""
+    """파일 삭제 (데이터셋은 기본 파일과 CSV 사본을 함께 삭제하고 카탈로그 등록 해제)"""
     try:
         file_path = os.path.join(UPLOAD_FOLDER, filename)
-        if os.path.exists(file_path) and filename.endswith(('.csv', '.json')):
-            os.remove(file_path)
-            return jsonify({'status': 'success', 'message': f'{filename}이 삭제되었습니다.'})
+        if os.path.exists(file_path) and filename.endswith(MANAGED_FILE_EXTENSIONS):
+            related_paths = dataset_file_group(file_path)
+            for path in related_paths:
+                os.remove(path)
+                dataset_catalog.remove(path)
+            message = f'{filename}이 삭제되었습니다.'
+            if len(related_paths) > 1:
+                message += f" (함께 저장된 {', '.join(os.path.basename(path) for path in related_paths if path != file_path)} 포함)"
+            return jsonify({'status': 'success', 'message': message})
         else:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
     except Exception as e:
@@ -2373,12 +2648,26 @@ def analyze():
                         })
                     });
                     
+                    // 분석 작업이 끝날 때까지 진행 상황 수신 (SSE 우선, 실패 시 폴링)
+                    let result = await response.json();
+                    if (result.status === 'pending' && window.EventSource) {
+                        result = await streamAIAnalysis(result.job_id);
+                    }
+                    while (result.status === 'pending') {
+                        await sleep(1000);
+                        const pollResponse = await fetch(`/ai_analysis/${result.job_id}`);
+                        result = await pollResponse.json();
+                        if (result.progress) {
+                            const done = result.progress.completed;
+                            const total = result.progress.total;
+                            await updateProgress(4, 65 + Math.round(15 * done / total), '🧠 OpenAI GPT 분석 실행 중...', `분석 섹션 ${done}/${total}개 완료`);
+                        }
+                    }
+                    
                     // 5단계: 결과 처리 (85%)
                     await updateProgress(5, 85, '📋 분석 결과 처리 중...', '받은 분석 결과를 정리하고 시각화하고 있습니다.');
                     await sleep(500);
                     
-                    const result = await response.json();
-                    
                     // 6단계: 완료 (100%)
                     await updateProgress(6, 100, '✅ 분석 완료!', '모든 분석이 성공적으로 완료되었습니다.');
                     
@@ -2418,6 +2707,32 @@ def analyze():
                 }
             }
             
+            // SSE로 섹션별 분석 결과를 완료되는 즉시 표시하고 최종 결과 반환
+            function streamAIAnalysis(jobId) {
+                return new Promise(resolve => {
+                    const source = new EventSource(`/ai_analysis/${jobId}/events`);
+                    const partialResult = {};
+                    
+                    source.addEventListener('section', event => {
+                        const data = JSON.parse(event.data);
+                        partialResult[data.section] = data.result;
+                        updateProgress(4, 65 + Math.round(15 * data.completed / data.total), '🧠 OpenAI GPT 분석 실행 중...', `분석 섹션 ${data.completed}/${data.total}개 완료`);
+                        displayAIInsights(partialResult);
+                    });
+                    
+                    source.addEventListener('complete', event => {
+                        source.close();
+                        resolve(JSON.parse(event.data));
+                    });
+                    
+                    source.onerror = () => {
+                        // 스트림 연결 실패 시 상태 폴링으로 전환
+                        source.close();
+                        resolve({status: 'pending', job_id: jobId});
+                    };
+                });
+            }
+            
             // 진행률 업데이트 함수
             async function updateProgress(step, percentage, message, detail) {
                 const progress = document.getElementById('aiAnalysisProgress');
@@ -2757,49 +3072,6 @@ def health():
         'python_version': sys.version.split()[0]
     })
 
-def analyze_time_pattern(df_history):
-    """히스토리 데이터에서 시간대별 활동 패턴을 분석"""
-    from datetime import datetime
-    import numpy as np
-    
-    try:
-        hour_counts = [0] * 24  # 24시간 배열
-        
-        for _, row in df_history.iterrows():
-            try:
-                # ISO 형식 날짜 파싱
-                visit_time = datetime.fromisoformat(row['last_visit'].replace('Z', '+00:00'))
-                hour = visit_time.hour
-                visit_count = int(row.get('visit_count', 1))
-                hour_counts[hour] += visit_count
-            except:
-                continue
-        
-        # 2시간 간격으로 그룹화
-        time_labels = []
-        time_activities = []
-        
-        for i in range(0, 24, 2):
-            if i + 1 < 24:
-                time_labels.append(f'{i:02d}-{i+2:02d}')
-                time_activities.append(hour_counts[i] + hour_counts[i+1])
-            else:
-                time_labels.append(f'{i:02d}-{(i+2)%24:02d}')
-                time_activities.append(hour_counts[i] + hour_counts[0])
-        
-        return {
-            'hours': time_labels,
-            'activities': time_activities
-        }
-        
-    except Exception as e:
-        print(f"시간대 분석 오류: {e}")
-        # 기본 패턴 반환
-        return {
-            'hours': ['00-02', '02-04', '04-06', '06-08', '08-10', '10-12', '12-14', '14-16', '16-18', '18-20', '20-22', '22-24'],
-            'activities': [2, 1, 0, 3, 8, 15, 12, 25, 22, 18, 12, 6]
-        }
-
 @application.route('/get_analysis_data')
 def get_analysis_data():
     """실제 수집된 데이터를 분석하여 반환"""
@@ -2807,75 +3079,19 @@ def get_analysis_data():
         return jsonify({'error': 'Consent not given'}), 403
     
     try:
-        analysis_data = {
-            'bookmarks': {'categories': [], 'counts': []},
-            'history': {'sites': [], 'visits': []},
-            'system': {'categories': [], 'counts': []},
-            'timePattern': {'hours': [], 'activities': []},
-            'stats': {
-                'bookmark_count': 0,
-                'history_count': 0,
-                'system_count': 0,
-                'total_visits': 0,
-                'categories': 0
-            }
-        }
-        
         uploads_dir = os.path.join(os.getcwd(), 'uploads')
         
-        # 북마크 데이터 분석
-        bookmark_files = [f for f in os.listdir(uploads_dir) if f.startswith('bookmarks_') and f.endswith('.csv')]
-        if bookmark_files:
-            latest_bookmark = max(bookmark_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_bookmarks = pd.read_csv(os.path.join(uploads_dir, latest_bookmark))
-            
-            # 카테고리별 북마크 수 계산
-            if 'category' in df_bookmarks.columns:
-                category_counts = df_bookmarks['category'].value_counts()
-                analysis_data['bookmarks']['categories'] = category_counts.index.tolist()
-                analysis_data['bookmarks']['counts'] = category_counts.values.tolist()
-            
-            analysis_data['stats']['bookmark_count'] = len(df_bookmarks)
-            analysis_data['stats']['categories'] = len(analysis_data['bookmarks']['categories'])
-        
-        # 히스토리 데이터 분석
-        history_files = [f for f in os.listdir(uploads_dir) if f.startswith('browser_history_') and f.endswith('.csv')]
-        if history_files:
-            latest_history = max(history_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_history = pd.read_csv(os.path.join(uploads_dir, latest_history))
-            
-            # 도메인별 방문 횟수 상위 10개
-            if 'domain' in df_history.columns and 'visit_count' in df_history.columns:
-                domain_visits = df_history.groupby('domain')['visit_count'].sum().sort_values(ascending=False).head(10)
-                analysis_data['history']['sites'] = domain_visits.index.tolist()
-                analysis_data['history']['visits'] = domain_visits.values.tolist()
-            
-            analysis_data['stats']['history_count'] = len(df_history)
-            if 'visit_count' in df_history.columns:
-                analysis_data['stats']['total_visits'] = df_history['visit_count'].sum()
-            
-            # 시간대별 활동 패턴 분석
-            if 'last_visit' in df_history.columns:
-                time_pattern = analyze_time_pattern(df_history)
-                analysis_data['timePattern'] = time_pattern
-        
-        # 시스템 데이터 분석
-        system_files = [f for f in os.listdir(uploads_dir) if f.startswith('system_info_') and f.endswith('.csv')]
-        if system_files:
-            latest_system = max(system_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-            df_system = pd.read_csv(os.path.join(uploads_dir, latest_system))
-            
-            # 카테고리별 시스템 정보 수 계산
-            if 'category' in df_system.columns:
-                category_counts = df_system['category'].value_counts()
-                analysis_data['system']['categories'] = category_counts.index.tolist()
-                analysis_data['system']['counts'] = category_counts.values.tolist()
-            
-            analysis_data['stats']['system_count'] = len(df_system)
+        # 시간대 차트 구간 폭(시간)과 선택적 타임존
+        bin_hours = min(24, max(1, request.args.get('bin_hours', 2, type=int)))
+        timezone = request.args.get('tz') or None
+        if timezone is not None:
+            try:
+                validate_timezone(timezone)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
         
-        # 일평균 방문 계산
-        if analysis_data['stats']['total_visits'] > 0:
-            analysis_data['stats']['avg_daily'] = round(analysis_data['stats']['total_visits'] / 30, 1)
+        # 최신 데이터셋 요약 스냅샷으로 차트 데이터 구성
+        analysis_data = DataAggregator(uploads_dir).chart_data(bin_hours, timezone)
         
         return jsonify(analysis_data)
         
@@ -2936,19 +3152,60 @@ def check_api_key():
             'has_key': False
         })
 
+def run_ai_analysis_job(job, api_key, analysis_mode, uploads_dir, stream_tokens=False):
+    """백그라운드 작업으로 AI 분석 수행 후 결과를 JSON 파일로 저장"""
+    # 수집된 데이터 준비
+    data_summary = prepare_data_for_ai_analysis(uploads_dir)
+    
+    # AI 분석기 초기화
+    analyzer = AIPersonalityAnalyzer(api_key, mode=analysis_mode)
+    
+    # 동일한 데이터/모델/프롬프트로 분석한 결과가 캐시에 있으면 재사용
+    cache_key = analyzer.get_cache_key(data_summary)
+    analysis_result = ai_result_cache.get(cache_key)
+    cached = analysis_result is not None
+    
+    if cached:
+        print(f"⚡ AI 분석 캐시 적중: {cache_key[:12]}")
+        for section in ('ai_insights', 'mbti_analysis', 'personality_traits', 'recommendations'):
+            job.section_completed(section, analysis_result.get(section))
+    else:
+        # 분석 수행 (섹션이 끝날 때마다 작업 진행 상태 갱신)
+        analysis_result = analyzer.analyze_user_profile(
+            data_summary,
+            progress_callback=job.section_completed,
+            token_callback=job.token_received if stream_tokens else None
+        )
+        
+        # OpenAI 분석 결과만 캐시 (기본 분석은 API 키가 생기면 다시 시도해야 함)
+        if analysis_result.get('ai_powered'):
+            ai_result_cache.put(cache_key, analysis_result)
+    
+    # 결과를 JSON 파일로 저장
+    result_filename = f"{UPLOAD_FOLDER}/ai_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(result_filename, 'w', encoding='utf-8') as f:
+        json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+    dataset_catalog.register('ai_analysis', result_filename)
+    
+    return {
+        'message': f'AI 분석이 완료되었습니다. {"OpenAI API를 사용했습니다." if analysis_result.get("ai_powered") else "기본 분석을 수행했습니다."}',
+        'filename': os.path.basename(result_filename),
+        'analysis_result': analysis_result,
+        'ai_powered': analysis_result.get('ai_powered', False),
+        'cached': cached
+    }
+
 @application.route('/ai_analysis', methods=['POST'])
 def ai_analysis():
-    """AI 기반 성향 분석 API"""
+    """AI 기반 성향 분석 API - 작업을 등록하고 작업 ID를 즉시 반환"""
     if not session.get('consent_given'):
         return jsonify({'error': 'Consent not given'}), 403
     
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         api_key = data.get('openai_api_key')  # 사용자가 제공한 API 키
-        
-        # 수집된 데이터 준비
-        uploads_dir = os.path.join(os.getcwd(), 'uploads')
-        data_summary = prepare_data_for_ai_analysis(uploads_dir)
+        analysis_mode = data.get('analysis_mode')  # 'combined'이면 단일 호출 통합 분석
+        stream_tokens = bool(data.get('stream_tokens'))  # SSE로 모델 토큰까지 스트리밍
         
         if not AI_ANALYZER_AVAILABLE:
             return jsonify({
@@ -2956,24 +3213,20 @@ def ai_analysis():
                 'message': 'AI 분석 모듈을 사용할 수 없습니다. ai_analyzer.py 파일을 확인해주세요.'
             }), 500
         
-        # AI 분석기 초기화
-        analyzer = AIPersonalityAnalyzer(api_key)
+        uploads_dir = os.path.join(os.getcwd(), 'uploads')
+        job = ai_job_manager.submit(run_ai_analysis_job, api_key, analysis_mode, uploads_dir, stream_tokens)
         
-        # 분석 수행
-        analysis_result = analyzer.analyze_user_profile(data_summary)
+        # wait=true이면 기존처럼 분석이 끝날 때까지 기다렸다가 결과 반환
+        if data.get('wait'):
+            job.wait()
+            job_data = job.to_dict()
+            return jsonify(job_data), (500 if job_data['status'] == 'error' else 200)
         
-        # 결과를 JSON 파일로 저장
-        result_filename = f"{UPLOAD_FOLDER}/ai_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(result_filename, 'w', encoding='utf-8') as f:
-            json.dump(analysis_result, f, ensure_ascii=False, indent=2)
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'AI 분석이 완료되었습니다. {"OpenAI API를 사용했습니다." if analysis_result.get("ai_powered") else "기본 분석을 수행했습니다."}',
-            'filename': os.path.basename(result_filename),
-            'analysis_result': analysis_result,
-            'ai_powered': analysis_result.get('ai_powered', False)
-        })
+        job_data = job.to_dict()
+        job_data['status_url'] = url_for('ai_analysis_status', job_id=job.job_id)
+        job_data['events_url'] = url_for('ai_analysis_events', job_id=job.job_id)
+        job_data['message'] = 'AI 분석 작업이 등록되었습니다.'
+        return jsonify(job_data), 202
         
     except Exception as e:
         return jsonify({
@@ -2981,6 +3234,68 @@ def ai_analysis():
             'message': f'AI 분석 중 오류가 발생했습니다: {str(e)}'
         }), 500
 
+@application.route('/ai_analysis/<job_id>')
+def ai_analysis_status(job_id):
+    """AI 분석 작업 진행 상태 및 결과 조회"""
+    if not session.get('consent_given'):
+        return jsonify({'error': 'Consent not given'}), 403
+    
+    job = ai_job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': '분석 작업을 찾을 수 없습니다. 만료되었거나 잘못된 작업 ID입니다.'
+        }), 404
+    
+    return jsonify(job.to_dict())
+
+@application.route('/ai_analysis/<job_id>/events')
+def ai_analysis_events(job_id):
+    """AI 분석 진행 상황을 Server-Sent Events로 스트리밍 (섹션 완료, 토큰, 최종 결과)"""
+    if not session.get('consent_given'):
+        return jsonify({'error': 'Consent not given'}), 403
+    
+    job = ai_job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': '분석 작업을 찾을 수 없습니다. 만료되었거나 잘못된 작업 ID입니다.'
+        }), 404
+    
+    # 재연결 시 브라우저가 보내는 마지막 이벤트 ID 이후부터 전송
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    
+    def generate():
+        sent = last_event_id
+        tokens = job.subscribe_tokens()
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                new_tokens, events, finished = job.wait_for_events(sent, timeout=15, tokens=tokens)
+                # 토큰 이벤트는 재연결 시 다시 보내지 않으므로 id 없이 전송
+                for token in new_tokens:
+                    payload = json.dumps(token['data'], ensure_ascii=False)
+                    yield f"event: {token['event']}\ndata: {payload}\n\n"
+                for event in events:
+                    payload = json.dumps(event['data'], ensure_ascii=False)
+                    yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+                sent += len(events)
+                if finished and not events:
+                    break
+                if not events and not new_tokens:
+                    # 프록시가 연결을 끊지 않도록 주기적으로 주석 전송
+                    yield ': keep-alive\n\n'
+        finally:
+            job.unsubscribe_tokens(tokens)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @application.route('/get_ai_analysis_data')
 def get_ai_analysis_data():
     """최신 AI 분석 결과 반환"""
@@ -2990,24 +3305,34 @@ def get_ai_analysis_data():
     try:
         uploads_dir = os.path.join(os.getcwd(), 'uploads')
         
+        # 현재 수집 데이터에 대한 분석 결과가 캐시에 있으면 바로 반환
+        if AI_ANALYZER_AVAILABLE:
+            cache_key = get_analysis_cache_key(prepare_data_for_ai_analysis(uploads_dir))
+            cached_result = ai_result_cache.get(cache_key)
+            if cached_result is not None:
+                return jsonify({
+                    'status': 'success',
+                    'analysis_result': cached_result,
+                    'filename': None,
+                    'cached': True
+                })
+        
         # 가장 최근 AI 분석 파일 찾기
-        analysis_files = [f for f in os.listdir(uploads_dir) if f.startswith('ai_analysis_') and f.endswith('.json')]
+        latest_analysis = get_catalog(uploads_dir).latest_path('ai_analysis')
         
-        if not analysis_files:
+        if not latest_analysis:
             return jsonify({
                 'status': 'no_data',
                 'message': 'AI 분석 결과가 없습니다. 먼저 AI 분석을 실행해주세요.'
             })
         
-        latest_analysis = max(analysis_files, key=lambda f: os.path.getctime(os.path.join(uploads_dir, f)))
-        
-        with open(os.path.join(uploads_dir, latest_analysis), 'r', encoding='utf-8') as f:
+        with open(latest_analysis, 'r', encoding='utf-8') as f:
             analysis_result = json.load(f)
         
         return jsonify({
             'status': 'success',
             'analysis_result': analysis_result,
-            'filename': latest_analysis
+            'filename': os.path.basename(latest_analysis)
         })
         
     except Exception as e:
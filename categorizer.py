@@ -0,0 +1,303 @@
+"""
+수집 항목 분류 모듈
+확장 프로그램/설치 프로그램 이름은 키워드 포함 여부로, 파일은 확장자로, 북마크/히스토리는 URL 도메인으로 카테고리를 판별
+키워드 표는 한 번만 정규식으로 컴파일하고, 사용자 규칙 파일(JSON)로 코드 수정 없이 확장 가능
+"""
+import json
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+DEFAULT_CATEGORY = 'other'
+
+# 사용자 규칙 파일 경로 (없으면 기본 규칙만 사용)
+CATEGORY_RULES_FILE = os.getenv('CATEGORY_RULES_FILE', '')
+# 분류기별 이름 → 카테고리 메모 크기 (가득 차면 비우고 다시 채움)
+CATEGORY_CACHE_SIZE = int(os.getenv('CATEGORY_CACHE_SIZE', '4096'))
+
+# 기본 분류 규칙 (먼저 나온 카테고리가 우선)
+EXTENSION_RULES = {
+    'development': ['postman', 'redux', 'react', 'vue', 'github', 'devtools', 'json', 'api'],
+    'productivity': ['notion', 'todoist', 'evernote', 'pocket', 'grammarly', 'metamask'],
+    'privacy': ['ublock', 'adblock', 'ghostery', 'privacy badger', 'disconnect'],
+    'security': ['lastpass', '1password', 'bitwarden', 'dashlane', 'keeper'],
+    'shopping': ['honey', 'rakuten', 'capital one', 'paypal', 'amazon'],
+    'accessibility': ['dark reader', 'mercury reader', 'stylus', 'zoom'],
+    'social': ['facebook', 'twitter', 'linkedin', 'pinterest', 'instagram'],
+    'media': ['youtube', 'netflix', 'spotify', 'soundcloud', 'twitch']
+}
+
+PROGRAM_RULES = {
+    'development': ['visual studio', 'code', 'python', 'java', 'git', 'node', 'npm', 'docker', 'intellij', 'eclipse', 'sublime', 'atom'],
+    'design': ['photoshop', 'illustrator', 'figma', 'sketch', 'canva', 'gimp', 'blender'],
+    'office': ['word', 'excel', 'powerpoint', 'outlook', 'teams', 'slack', 'notion', 'trello'],
+    'browser': ['chrome', 'firefox', 'safari', 'edge', 'opera'],
+    'media': ['spotify', 'youtube', 'vlc', 'media player', 'itunes', 'netflix'],
+    'communication': ['discord', 'telegram', 'whatsapp', 'zoom', 'skype', 'kakao'],
+    'gaming': ['steam', 'game', 'epic', 'origin', 'battle.net'],
+    'utility': ['winrar', 'zip', 'antivirus', 'cleaner', 'driver']
+}
+
+FILE_RULES = {
+    'document': ['.docx', '.doc', '.pdf', '.txt', '.rtf', '.odt', '.pages'],
+    'spreadsheet': ['.xlsx', '.xls', '.csv', '.ods', '.numbers'],
+    'presentation': ['.pptx', '.ppt', '.odp', '.key'],
+    'code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.ts', '.jsx', '.vue', '.json', '.xml', '.yaml', '.yml'],
+    'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff', '.ico'],
+    'media': ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.mp3', '.wav', '.flac', '.aac'],
+    'archive': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'],
+    'design': ['.psd', '.ai', '.sketch', '.fig', '.xd', '.indd']
+}
+
+# 도메인 규칙: 등록 도메인 또는 호스트 (하위 도메인까지 일치, 더 구체적인 호스트가 우선)
+DOMAIN_RULES = {
+    'ai': ['openai.com', 'chatgpt.com', 'claude.ai', 'anthropic.com', 'gemini.google.com', 'perplexity.ai', 'huggingface.co'],
+    'development': ['github.com', 'gitlab.com', 'stackoverflow.com', 'stackexchange.com', 'developer.mozilla.org',
+                    'python.org', 'pypi.org', 'npmjs.com', 'react.dev', 'tailwindcss.com', 'readthedocs.io', 'dev.to'],
+    'cloud': ['aws.amazon.com', 'cloud.google.com', 'azure.microsoft.com', 'portal.azure.com', 'vercel.com',
+              'netlify.com', 'heroku.com', 'render.com'],
+    'education': ['coursera.org', 'udemy.com', 'edx.org', 'khanacademy.org', 'inflearn.com', 'wikipedia.org'],
+    'entertainment': ['youtube.com', 'netflix.com', 'twitch.tv', 'spotify.com', 'disneyplus.com', 'tving.com', 'wavve.com', 'watcha.com'],
+    'social': ['reddit.com', 'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'threads.net'],
+    'professional': ['linkedin.com', 'notion.so', 'slack.com', 'atlassian.net', 'figma.com', 'trello.com'],
+    'shopping': ['amazon.com', 'coupang.com', 'gmarket.co.kr', '11st.co.kr', 'aliexpress.com', 'ebay.com'],
+    'news': ['news.naver.com', 'medium.com', 'bbc.com', 'cnn.com', 'nytimes.com'],
+    'search': ['google.com', 'naver.com', 'daum.net', 'bing.com']
+}
+
+class KeywordCategorizer:
+    """이름에 포함된 키워드로 분류 (여러 카테고리 키워드가 있으면 규칙 순서상 앞선 카테고리)
+
+    모든 키워드를 우선순위 순서의 단일 정규식 대안(alternation)으로 컴파일하고, 전방탐색으로
+    겹치는 위치까지 한 번에 훑어 이름당 카테고리 × 키워드 반복 없이 기존 분류 결과를 그대로 재현
+    """
+
+    def __init__(self, rules: Dict[str, List[str]], default: str = DEFAULT_CATEGORY):
+        self.rules = OrderedDict((category, list(keywords)) for category, keywords in rules.items())
+        self.default = default
+
+        # 키워드 → 카테고리 순위 (같은 키워드가 여러 카테고리에 있으면 앞선 카테고리)
+        self._categories = list(self.rules)
+        self._rank = {}
+        for rank, keywords in enumerate(self.rules.values()):
+            for keyword in keywords:
+                self._rank.setdefault(keyword.lower(), rank)
+
+        # 대안은 첫 번째로 일치한 것이 선택되므로 같은 위치에서는 우선순위가 높은 키워드가 잡힘
+        ordered = sorted(self._rank, key=lambda keyword: self._rank[keyword])
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))') if ordered else None
+        # 컬럼 일괄 분류용 카테고리별 패턴 (np.select가 앞선 조건을 우선하므로 규칙 순서 유지)
+        self._category_patterns = [
+            (category, '|'.join(re.escape(keyword) for keyword in self._rank if self._rank[keyword] == rank))
+            for rank, category in enumerate(self._categories)
+        ]
+        self._memo = {}
+
+    def categorize(self, name: Optional[str]) -> str:
+        category = self._memo.get(name)
+        if category is None:
+            category = self._categorize(name)
+            _remember(self._memo, {name: category})
+        return category
+
+    def _categorize(self, name: Optional[str]) -> str:
+        if not name or self._pattern is None:
+            return self.default
+        best = None
+        for match in self._pattern.finditer(name.lower()):
+            rank = self._rank[match.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return self._categories[best] if best is not None else self.default
+
+    def categorize_series(self, names: pd.Series) -> pd.Series:
+        """이름 컬럼 전체를 분류 (고유값만 문자열 벡터 연산으로 분류하고 결과는 메모해 재사용)"""
+        codes, uniques = pd.factorize(names)
+        uniques = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+        categories = uniques.map(self._memo).astype(object)
+
+        pending = categories.isna()
+        if pending.any():
+            lowered = uniques[pending].str.lower()
+            conditions = [lowered.str.contains(pattern, regex=True, na=False)
+                          for _, pattern in self._category_patterns if pattern]
+            choices = [category for category, pattern in self._category_patterns if pattern]
+            computed = np.select(conditions, choices, default=self.default).astype(object) if conditions \
+                else np.full(len(lowered), self.default, dtype=object)
+            categories[pending] = computed
+            _remember(self._memo, dict(zip(uniques[pending], computed)))
+
+        return _take(categories, codes, self.default, names.index)
+
+    def categorize_all(self, names: Iterable[Optional[str]]) -> List[str]:
+        """여러 이름을 한 번에 분류"""
+        return self.categorize_series(pd.Series(list(names), dtype=object)).tolist()
+
+class ExtensionCategorizer:
+    """파일 확장자 → 카테고리 해시 맵으로 분류"""
+
+    def __init__(self, rules: Dict[str, List[str]], default: str = DEFAULT_CATEGORY):
+        self.rules = OrderedDict((category, list(extensions)) for category, extensions in rules.items())
+        self.default = default
+        self._lookup = {}
+        for category, extensions in self.rules.items():
+            for extension in extensions:
+                self._lookup.setdefault(_normalize_extension(extension), category)
+
+    def categorize(self, file_path: Optional[str]) -> str:
+        if not file_path:
+            return self.default
+        return self._lookup.get(os.path.splitext(file_path)[1].lower(), self.default)
+
+    def categorize_series(self, file_paths: pd.Series) -> pd.Series:
+        """경로 컬럼 전체를 분류 (고유 경로의 확장자만 뽑아 해시 맵으로 일괄 조회)"""
+        codes, uniques = pd.factorize(file_paths)
+        extensions = pd.Series([os.path.splitext(str(path))[1].lower() for path in uniques], dtype=object)
+        return _take(extensions.map(self._lookup), codes, self.default, file_paths.index)
+
+    def categorize_all(self, file_paths: Iterable[Optional[str]]) -> List[str]:
+        """여러 파일을 한 번에 분류"""
+        return self.categorize_series(pd.Series(list(file_paths), dtype=object)).tolist()
+
+@lru_cache(maxsize=CATEGORY_CACHE_SIZE)
+def url_host(url: str) -> str:
+    """URL의 호스트 이름 (소문자, 'www.' 제거, 파싱할 수 없으면 빈 문자열)"""
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+class DomainCategorizer:
+    """URL 호스트를 도메인 규칙으로 분류
+
+    규칙의 도메인을 해시 맵(호스트 접미사 인덱스)에 담아 두고, 호스트의 긴 접미사부터
+    (a.b.example.com → b.example.com → example.com) 조회하므로 라벨 수만큼의 조회로 판별
+    """
+
+    def __init__(self, rules: Dict[str, List[str]], default: str = DEFAULT_CATEGORY):
+        self.rules = OrderedDict((category, list(domains)) for category, domains in rules.items())
+        self.default = default
+        self._index = {}
+        for category, domains in self.rules.items():
+            for domain in domains:
+                self._index.setdefault(domain.lower().strip('.'), category)
+        # 결과 카테고리 목록 (규칙 순서, 기본 카테고리는 마지막)
+        self.categories = list(self.rules) + ([default] if default not in self.rules else [])
+        self._memo = {}
+
+    def categorize_host(self, host: str) -> str:
+        category = self._memo.get(host)
+        if category is None:
+            category = self.default
+            labels = host.split('.')
+            for i in range(len(labels)):
+                match = self._index.get('.'.join(labels[i:]))
+                if match is not None:
+                    category = match
+                    break
+            _remember(self._memo, {host: category})
+        return category
+
+    def categorize(self, url: Optional[str]) -> str:
+        if not url or not isinstance(url, str):
+            return self.default
+        return self.categorize_host(url_host(url))
+
+    def categorize_series(self, urls: pd.Series) -> pd.Series:
+        """URL 컬럼 전체를 분류해 범주형(category) Series로 반환 (고유 URL만 한 번씩 파싱)"""
+        codes, uniques = pd.factorize(urls)
+        categories = pd.Series([self.categorize(url) for url in uniques], dtype=object)
+        values = _take(categories, codes, self.default, urls.index)
+        return values.astype(pd.CategoricalDtype(self.categories))
+
+    def categorize_all(self, urls: Iterable[Optional[str]]) -> List[str]:
+        """여러 URL을 한 번에 분류"""
+        return self.categorize_series(pd.Series(list(urls), dtype=object)).tolist()
+
+def _take(categories: pd.Series, codes: np.ndarray, default: str, index) -> pd.Series:
+    """고유값별 분류 결과를 factorize 코드로 원래 행에 펼침 (결측/미분류는 기본 카테고리)"""
+    lookup = np.append(categories.fillna(default).to_numpy(dtype=object), default)
+    return pd.Series(lookup[np.where(codes < 0, len(lookup) - 1, codes)], index=index, dtype=object)
+
+def _remember(memo: dict, values: dict):
+    """분류 결과 메모 (한도를 넘으면 비우고 다시 채움)"""
+    if len(memo) + len(values) > CATEGORY_CACHE_SIZE:
+        memo.clear()
+    if len(values) <= CATEGORY_CACHE_SIZE:
+        memo.update(values)
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.lower()
+    return extension if extension.startswith('.') else '.' + extension
+
+def merge_rules(base: Dict[str, List[str]], extra: Optional[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """사용자 규칙을 기본 규칙 앞에 합침 (사용자 규칙의 카테고리가 먼저 검사됨)"""
+    merged = OrderedDict()
+    for rules in (extra or {}, base):
+        for category, keywords in rules.items():
+            merged.setdefault(category, []).extend(keywords)
+    return merged
+
+def load_rule_file(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """사용자 규칙 파일 읽기
+
+    형식: {"extensions": {카테고리: [키워드, ...]}, "programs": {...}, "files": {카테고리: [".확장자", ...]},
+          "domains": {카테고리: ["example.com", ...]}}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f, object_pairs_hook=OrderedDict)
+    if not isinstance(data, dict):
+        raise ValueError("분류 규칙 파일은 JSON 객체여야 합니다")
+
+    rules = {}
+    for kind in ('extensions', 'programs', 'files', 'domains'):
+        table = data.get(kind) or {}
+        if not isinstance(table, dict) or not all(isinstance(words, list) for words in table.values()):
+            raise ValueError(f"분류 규칙 '{kind}' 형식이 올바르지 않습니다")
+        rules[kind] = OrderedDict((str(category), [str(word) for word in words]) for category, words in table.items())
+    return rules
+
+class CategorizerSet:
+    """확장 프로그램/설치 프로그램/파일/URL 도메인 분류기 묶음"""
+
+    def __init__(self, rule_file: Optional[str] = None):
+        extra = {}
+        if rule_file:
+            try:
+                extra = load_rule_file(rule_file)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 분류 규칙 파일을 읽지 못해 기본 규칙을 사용합니다 ({rule_file}): {e}")
+
+        self.rule_file = rule_file
+        self.extensions = KeywordCategorizer(merge_rules(EXTENSION_RULES, extra.get('extensions')))
+        self.programs = KeywordCategorizer(merge_rules(PROGRAM_RULES, extra.get('programs')))
+        self.files = ExtensionCategorizer(merge_rules(FILE_RULES, extra.get('files')))
+        self.domains = DomainCategorizer(merge_rules(DOMAIN_RULES, extra.get('domains')))
+
+_categorizers = None
+_categorizers_lock = threading.Lock()
+
+def get_categorizers() -> CategorizerSet:
+    """프로세스 공용 분류기 (첫 호출 시 규칙 파일을 읽어 컴파일)"""
+    global _categorizers
+    with _categorizers_lock:
+        if _categorizers is None:
+            _categorizers = CategorizerSet(CATEGORY_RULES_FILE)
+        return _categorizers
+
+def reload_categorizers(rule_file: Optional[str] = None) -> CategorizerSet:
+    """규칙 파일을 다시 읽어 분류기 재생성 (rule_file을 주면 해당 파일 사용)"""
+    global _categorizers
+    categorizers = CategorizerSet(rule_file if rule_file is not None else CATEGORY_RULES_FILE)
+    with _categorizers_lock:
+        _categorizers = categorizers
+    return categorizers
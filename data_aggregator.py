@@ -0,0 +1,295 @@
+"""
+데이터 집계 모듈
+데이터셋마다 한 번의 계산으로 모든 통계(카테고리 수, 상위 도메인, 시간대 분포, 합계)를 요약 스냅샷으로 만들고,
+분석 페이지 차트 데이터와 AI 분석용 데이터 요약을 모두 이 스냅샷에서 구성
+"""
+import os
+import numpy as np
+import pandas as pd
+from dateutil import tz as dateutil_tz
+from typing import Dict, Any, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dataset_catalog import get_catalog
+from dataset_store import read_dataset_cached
+
+# 상위 목록(도메인, 폴더) 보관 개수
+SUMMARY_TOP_N = 10
+
+def validate_timezone(tz: str) -> str:
+    """IANA 타임존 이름 검증 (예: 'Asia/Seoul'), 알 수 없는 이름이면 ValueError"""
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"알 수 없는 타임존입니다: {tz}")
+    return tz
+
+def to_timezone(times: pd.Series, tz: str) -> pd.Series:
+    """수집기가 기록한 로컬 시각(타임존 정보 없음)을 이 컴퓨터의 타임존으로 해석한 뒤 tz 시각으로 변환"""
+    if times.dt.tz is None:
+        times = times.dt.tz_localize(dateutil_tz.tzlocal(), ambiguous='NaT', nonexistent='shift_forward')
+    return times.dt.tz_convert(tz)
+
+def hour_histogram(df_history: pd.DataFrame, tz: Optional[str] = None) -> np.ndarray:
+    """last_visit 시각 기준 24시간 방문 수 배열 (visit_count가 있으면 가중치로 사용)
+
+    tz: 지정하면 로컬 시각을 해당 타임존의 시각으로 변환
+    """
+    # ISO 형식 날짜를 한 번에 파싱 (파싱 실패 값은 NaT로 제외)
+    visit_times = pd.to_datetime(df_history['last_visit'], errors='coerce', format='ISO8601')
+    if tz is not None:
+        visit_times = to_timezone(visit_times, tz)
+
+    if 'visit_count' in df_history.columns:
+        weights = pd.to_numeric(df_history['visit_count'], errors='coerce')
+    else:
+        weights = pd.Series(1, index=df_history.index)
+
+    valid = visit_times.notna() & weights.notna()
+    return np.bincount(
+        visit_times[valid].dt.hour.to_numpy(),
+        weights=weights[valid].to_numpy(dtype=float),
+        minlength=24
+    )
+
+def activity_hour_histogram(df_activity: pd.DataFrame, tz: Optional[str] = None) -> np.ndarray:
+    """SQLite에서 집계된 (날짜, 시간대, 방문 수) 데이터의 24시간 방문 수 배열
+
+    tz: 지정하면 (날짜, 로컬 시간대)를 해당 타임존의 시간대로 변환 (date 컬럼 필요)
+    """
+    if tz is None:
+        return np.bincount(
+            df_activity['hour'].to_numpy(dtype=int),
+            weights=df_activity['visit_count'].to_numpy(dtype=float),
+            minlength=24
+        )
+
+    hour_starts = pd.to_datetime(df_activity['date'], errors='coerce', format='ISO8601') \
+        + pd.to_timedelta(df_activity['hour'].to_numpy(dtype=int), unit='h')
+    hour_starts = to_timezone(hour_starts, tz)
+    valid = hour_starts.notna()
+    return np.bincount(
+        hour_starts[valid].dt.hour.to_numpy(),
+        weights=df_activity['visit_count'][valid].to_numpy(dtype=float),
+        minlength=24
+    )
+
+def _counts(series: pd.Series, top_n: Optional[int] = None) -> Dict[str, int]:
+    counts = series.value_counts()
+    counts = counts[counts > 0]  # 범주형 컬럼의 관측되지 않은 카테고리 제외
+    if top_n is not None:
+        counts = counts.head(top_n)
+    return {str(key): int(value) for key, value in counts.items()}
+
+def summarize_dataset(kind: str, df: pd.DataFrame, df_activity: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """데이터셋 종류별 요약 스냅샷 (JSON 직렬화 가능한 기본 타입만 사용)
+
+    df_activity: 브라우저 히스토리와 함께 수집된 방문 1회 단위 시간대 집계 (있으면 시간대 분포에 우선 사용)
+    """
+    summary = {'row_count': len(df)}
+
+    if 'category' in df.columns:
+        summary['category_counts'] = _counts(df['category'])
+
+    if kind == 'bookmarks' and 'folder' in df.columns:
+        summary['folder_counts'] = _counts(df['folder'], SUMMARY_TOP_N)
+
+    if kind == 'browser_history':
+        if 'domain' in df.columns:
+            summary['domain_counts'] = _counts(df['domain'], SUMMARY_TOP_N)
+            if 'visit_count' in df.columns:
+                domain_visits = df.groupby('domain')['visit_count'].sum().sort_values(ascending=False).head(SUMMARY_TOP_N)
+                summary['domain_visits'] = {str(key): int(value) for key, value in domain_visits.items()}
+        if 'visit_count' in df.columns:
+            summary['total_visits'] = int(df['visit_count'].sum())
+
+        if df_activity is not None and not df_activity.empty:
+            summary['hour_counts'] = [int(round(value)) for value in activity_hour_histogram(df_activity)]
+            summary['hour_source'] = 'visit_activity'
+        elif 'last_visit' in df.columns:
+            summary['hour_counts'] = [int(round(value)) for value in hour_histogram(df)]
+            summary['hour_source'] = 'last_visit'
+
+    return summary
+
+def paired_activity_path(history_path: str) -> str:
+    """브라우저 히스토리 데이터셋과 같은 타임스탬프로 저장된 방문 활동 집계 경로"""
+    history_name = os.path.basename(history_path)
+    return os.path.join(os.path.dirname(history_path), history_name.replace('browser_history_', 'visit_activity_', 1))
+
+def latest_summary(catalog, kind: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """종류별 최신 데이터셋의 (카탈로그 항목, 요약) 반환
+
+    요약 없이 등록된 데이터셋(요약 도입 이전 수집분)은 한 번 읽어서 요약을 계산하고 카탈로그에 저장
+    """
+    entry = catalog.latest(kind)
+    if entry is None:
+        return None, None
+    if entry.get('summary') is not None:
+        return entry, entry['summary']
+
+    df_activity = None
+    if kind == 'browser_history':
+        activity_path = paired_activity_path(entry['path'])
+        if os.path.exists(activity_path):
+            df_activity = read_dataset_cached(activity_path, columns=['hour', 'visit_count'])
+
+    summary = summarize_dataset(kind, read_dataset_cached(entry['path']), df_activity)
+    catalog.set_summary(entry['path'], summary)
+    return entry, summary
+
+def group_hour_counts(hour_counts, bin_hours: int = 2) -> Dict[str, list]:
+    """24시간 방문 수 배열을 차트용 시간대 구간(bin_hours 간격)으로 그룹화"""
+    starts = np.arange(0, 24, bin_hours)
+    activities = np.add.reduceat(np.asarray(hour_counts, dtype=float), starts)
+
+    return {
+        'hours': [f'{start:02d}-{min(start + bin_hours, 24):02d}' for start in starts],
+        'activities': [int(round(value)) for value in activities]
+    }
+
+def analyze_time_pattern(df_history: pd.DataFrame, bin_hours: int = 2, tz: Optional[str] = None) -> Dict[str, list]:
+    """히스토리 last_visit 기준 시간대별 활동 패턴 (bin_hours 간격 구간)
+
+    tz: 지정하면 로컬 시각을 해당 타임존(예: 'Asia/Seoul')의 시각으로 변환 (호출 전에 validate_timezone으로 검증)
+    """
+    try:
+        return group_hour_counts(hour_histogram(df_history, tz), bin_hours)
+    except Exception as e:
+        print(f"시간대 분석 오류: {e}")
+        # 기본 패턴 반환
+        return {
+            'hours': ['00-02', '02-04', '04-06', '06-08', '08-10', '10-12', '12-14', '14-16', '16-18', '18-20', '20-22', '22-24'],
+            'activities': [2, 1, 0, 3, 8, 15, 12, 25, 22, 18, 12, 6]
+        }
+
+class DataAggregator:
+    """업로드 디렉토리의 최신 데이터셋 요약으로 분석 페이지 차트 데이터와 AI 분석용 요약을 구성
+
+    종류별 요약은 인스턴스 안에서 한 번만 조회하므로 두 결과를 함께 만들어도 같은 스냅샷을 공유
+    """
+
+    def __init__(self, uploads_dir: str):
+        self.catalog = get_catalog(uploads_dir)
+        self._summaries = {}
+
+    def summary(self, kind: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """종류별 최신 데이터셋의 (카탈로그 항목, 요약)"""
+        if kind not in self._summaries:
+            self._summaries[kind] = latest_summary(self.catalog, kind)
+        return self._summaries[kind]
+
+    def chart_data(self, bin_hours: int = 2, tz: Optional[str] = None) -> Dict[str, Any]:
+        """분석 페이지(/get_analysis_data) 차트 데이터"""
+        analysis_data = {
+            'bookmarks': {'categories': [], 'counts': []},
+            'history': {'sites': [], 'visits': []},
+            'system': {'categories': [], 'counts': []},
+            'timePattern': {'hours': [], 'activities': []},
+            'stats': {
+                'bookmark_count': 0,
+                'history_count': 0,
+                'system_count': 0,
+                'total_visits': 0,
+                'categories': 0
+            }
+        }
+
+        # 카테고리별 북마크 수
+        _, bookmark_summary = self.summary('bookmarks')
+        if bookmark_summary:
+            category_counts = bookmark_summary.get('category_counts', {})
+            analysis_data['bookmarks']['categories'] = list(category_counts.keys())
+            analysis_data['bookmarks']['counts'] = list(category_counts.values())
+
+            analysis_data['stats']['bookmark_count'] = bookmark_summary['row_count']
+            analysis_data['stats']['categories'] = len(analysis_data['bookmarks']['categories'])
+
+        # 도메인별 방문 횟수 상위 10개와 시간대별 활동 패턴
+        history_entry, history_summary = self.summary('browser_history')
+        if history_summary:
+            domain_visits = history_summary.get('domain_visits', {})
+            analysis_data['history']['sites'] = list(domain_visits.keys())
+            analysis_data['history']['visits'] = list(domain_visits.values())
+
+            analysis_data['stats']['history_count'] = history_summary['row_count']
+            analysis_data['stats']['total_visits'] = history_summary.get('total_visits', 0)
+
+            # 요약의 시간대 분포는 로컬 시각 기준이므로 타임존 지정 시에만 원본에서 다시 계산
+            df_activity = None
+            activity_path = paired_activity_path(history_entry['path'])
+            if tz and history_summary.get('hour_source') == 'visit_activity' and os.path.exists(activity_path):
+                df_activity = read_dataset_cached(activity_path, columns=['date', 'hour', 'visit_count'])
+
+            if df_activity is not None and 'date' in df_activity.columns:
+                analysis_data['timePattern'] = group_hour_counts(activity_hour_histogram(df_activity, tz), bin_hours)
+            elif tz:
+                df_history = read_dataset_cached(history_entry['path'], columns=['last_visit', 'visit_count'])
+                analysis_data['timePattern'] = analyze_time_pattern(df_history, bin_hours, tz)
+            elif 'hour_counts' in history_summary:
+                analysis_data['timePattern'] = group_hour_counts(history_summary['hour_counts'], bin_hours)
+
+        # 카테고리별 시스템 정보 수
+        _, system_summary = self.summary('system_info')
+        if system_summary:
+            category_counts = system_summary.get('category_counts', {})
+            analysis_data['system']['categories'] = list(category_counts.keys())
+            analysis_data['system']['counts'] = list(category_counts.values())
+
+            analysis_data['stats']['system_count'] = system_summary['row_count']
+
+        # 일평균 방문 계산
+        if analysis_data['stats']['total_visits'] > 0:
+            analysis_data['stats']['avg_daily'] = round(analysis_data['stats']['total_visits'] / 30, 1)
+
+        return analysis_data
+
+    def ai_summary(self) -> Dict[str, Any]:
+        """AI 분석(prepare_data_for_ai_analysis)용 데이터 요약"""
+        data_summary = {
+            'bookmark_categories': [],
+            'top_sites': [],
+            'software_categories': {},
+            'extensions': [],
+            'recent_files': [],
+            'network_stats': {},
+            'total_bookmarks': 0,
+            'total_visits': 0,
+            'total_programs': 0
+        }
+
+        try:
+            _, bookmark_summary = self.summary('bookmarks')
+            if bookmark_summary:
+                if 'folder_counts' in bookmark_summary:
+                    data_summary['bookmark_categories'] = bookmark_summary['folder_counts']
+                data_summary['total_bookmarks'] = bookmark_summary['row_count']
+
+            _, history_summary = self.summary('browser_history')
+            if history_summary:
+                if 'domain_counts' in history_summary:
+                    data_summary['top_sites'] = history_summary['domain_counts']
+                if 'total_visits' in history_summary:
+                    data_summary['total_visits'] = history_summary['total_visits']
+
+            _, extension_summary = self.summary('chrome_extensions')
+            if extension_summary and 'category_counts' in extension_summary:
+                data_summary['extensions'] = extension_summary['category_counts']
+
+            _, program_summary = self.summary('installed_programs')
+            if program_summary:
+                if 'category_counts' in program_summary:
+                    data_summary['software_categories'] = program_summary['category_counts']
+                data_summary['total_programs'] = program_summary['row_count']
+
+            _, recent_summary = self.summary('recent_files')
+            if recent_summary and 'category_counts' in recent_summary:
+                data_summary['recent_files'] = recent_summary['category_counts']
+
+            _, network_summary = self.summary('network_info')
+            if network_summary and 'category_counts' in network_summary:
+                data_summary['network_stats'] = network_summary['category_counts']
+
+        except Exception as e:
+            print(f"데이터 준비 중 오류: {e}")
+
+        return data_summary
@@ -6,6 +6,17 @@ from datetime import datetime, timedelta
 import pandas as pd
 import glob
 import shutil
+import tempfile
+import threading
+import time
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+from xml.etree import ElementTree
+from typing import NamedTuple, Optional
+from categorizer import get_categorizers
 
 # psutil import with fallback
 try:
@@ -26,113 +37,454 @@ def is_aws_environment():
     ]
     return any(aws_indicators)
 
+class ProcessSample(NamedTuple):
+    """프로세스 측정값 (CPU/메모리 사용률은 접근 불가 시 None)"""
+    pid: int
+    name: Optional[str]
+    cpu_percent: Optional[float]
+    memory_percent: Optional[float]
+
+# 상위 프로세스 정렬 기준 → 측정값 필드
+PROCESS_SORT_FIELDS = {'cpu': 'cpu_percent', 'memory': 'memory_percent'}
+
+# 시스템 정보에 포함할 상위 프로세스 수 기본값
+TOP_PROCESS_COUNT = int(os.getenv('TOP_PROCESS_COUNT', '10'))
+
+class CpuSampler:
+    """백그라운드 스레드에서 시스템/프로세스별 CPU 사용률을 주기적으로 측정
+
+    psutil의 cpu_percent는 직전 호출 이후의 사용률을 계산하므로, 요청 안에서 1초씩 대기하거나
+    처음 조회한 프로세스가 항상 0.0%로 나오는 대신 계속 갱신되는 최근 측정값을 제공
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval if interval is not None else float(os.getenv('CPU_SAMPLE_INTERVAL', '2'))
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._cpu_percent = None
+        self._processes = []
+        self._sampled_at = None
+
+    def start(self):
+        """샘플러 스레드 시작 (이미 실행 중이면 무시)"""
+        if not PSUTIL_AVAILABLE:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='cpu-sampler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        primed = False
+        while True:
+            try:
+                if not primed:
+                    # 첫 측정은 기준점 설정용이므로 짧게 기다린 뒤 바로 한 번 더 측정
+                    self._sample()
+                    primed = True
+                    time.sleep(min(self.interval, 0.5))
+                cpu_percent, processes = self._sample()
+                with self._lock:
+                    self._cpu_percent = cpu_percent
+                    self._processes = processes
+                    self._sampled_at = time.time()
+            except Exception as e:
+                print(f"CPU 사용률 측정 실패: {e}")
+            finally:
+                # 측정에 실패해도 대기 중인 요청이 타임아웃까지 막히지 않도록 항상 알림
+                self._ready.set()
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _sample():
+        """직전 측정 이후의 시스템 CPU 사용률과 프로세스별 측정값 목록"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        # process_iter는 Process 객체를 내부에 캐시하므로 프로세스별 cpu_percent도 직전 측정 기준
+        processes = [
+            ProcessSample(proc.info['pid'], proc.info['name'], proc.info['cpu_percent'], proc.info['memory_percent'])
+            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent'])
+        ]
+        return cpu_percent, processes
+
+    def snapshot(self, timeout=None):
+        """(시스템 CPU 사용률, 프로세스별 측정값 목록, 측정 시각) 반환
+
+        아직 첫 측정 전이면 최대 timeout초 기다리고, 그래도 없으면 (None, [], None)
+        """
+        self._ready.wait(timeout)
+        with self._lock:
+            return self._cpu_percent, list(self._processes), self._sampled_at
+
+# 프로세스 공용 CPU 샘플러 (애플리케이션 시작 시 start() 호출)
+cpu_sampler = CpuSampler()
+
+# 확장 프로그램 manifest.json 동시 읽기 수
+EXTENSION_READ_WORKERS = int(os.getenv('EXTENSION_READ_WORKERS', '8'))
+
+# (확장 프로그램 ID, 버전 폴더, 버전 폴더 mtime) → 파싱된 manifest (읽기 실패 시 None)
+_manifest_cache = {}
+_manifest_cache_lock = threading.Lock()
+
+def _version_key(version):
+    """확장 프로그램 버전 폴더명(예: '1.46.0_0')을 숫자 단위로 비교하기 위한 키"""
+    return tuple(int(part) if part.isdigit() else -1 for part in re.split(r'[._]', version))
+
+def _read_extension_manifest(ext_id, version_path, mtime):
+    """버전 폴더의 manifest.json에서 필요한 필드만 읽기 (버전 폴더가 바뀌지 않았으면 캐시 사용)"""
+    key = (ext_id, version_path, mtime)
+    with _manifest_cache_lock:
+        if key in _manifest_cache:
+            return _manifest_cache[key]
+    
+    try:
+        with open(os.path.join(version_path, "manifest.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest = {field: manifest[field] for field in ('name', 'version', 'description', 'permissions') if field in manifest}
+    except Exception:
+        manifest = None
+    
+    with _manifest_cache_lock:
+        _manifest_cache[key] = manifest
+    return manifest
+
+# Chrome이 히스토리 DB를 잠그고 있을 때 복사본으로 넘어가기 전 대기 시간 (초, 기본은 기다리지 않고 바로 복사)
+HISTORY_LOCK_TIMEOUT = float(os.getenv('HISTORY_LOCK_TIMEOUT', '0'))
+
+# 프로필별 수집 동시 실행 수
+PROFILE_WORKERS = int(os.getenv('CHROME_PROFILE_WORKERS', '4'))
+
+def get_chrome_user_data_dir():
+    """운영체제별 Chrome 사용자 데이터(User Data) 디렉토리"""
+    system = platform.system()
+    if system == "Windows":
+        return os.path.expanduser("~\\AppData\\Local\\Google\\Chrome\\User Data")
+    elif system == "Darwin":  # macOS
+        return os.path.expanduser("~/Library/Application Support/Google/Chrome")
+    else:  # Linux
+        return os.path.expanduser("~/.config/google-chrome")
+
+def discover_chrome_profiles(user_data_dir):
+    """Chrome 프로필 디렉토리 이름 목록 (Local State의 프로필 목록 + 디렉토리 스캔, Default 우선)
+    
+    프로필을 하나도 찾지 못하면 ['Default']
+    """
+    profiles = set()
+    
+    # Local State에 등록된 프로필 (사용자가 이름을 바꾼 프로필 디렉토리 포함)
+    try:
+        with open(os.path.join(user_data_dir, 'Local State'), 'r', encoding='utf-8') as f:
+            info_cache = json.load(f).get('profile', {}).get('info_cache', {})
+        profiles.update(name for name in info_cache if os.path.isdir(os.path.join(user_data_dir, name)))
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    # Local State가 없거나 오래된 경우를 위한 디렉토리 스캔
+    try:
+        with os.scandir(user_data_dir) as it:
+            for entry in it:
+                if entry.is_dir() and (entry.name == 'Default' or entry.name.startswith('Profile ')):
+                    profiles.add(entry.name)
+    except OSError:
+        pass
+    
+    if not profiles:
+        return ['Default']
+    
+    def sort_key(name):
+        number = re.search(r'\d+', name)
+        return (name != 'Default', int(number.group()) if number else float('inf'), name)
+    
+    return sorted(profiles, key=sort_key)
+
+def run_per_profile(func, profiles):
+    """프로필마다 func(profile)을 스레드 풀에서 실행하고 결과 목록을 프로필 순서대로 반환
+    
+    실패한 프로필은 건너뛰며(None) 다른 프로필 수집에는 영향을 주지 않음
+    """
+    def run(profile):
+        try:
+            return func(profile)
+        except Exception as e:
+            print(f"⚠️ Chrome 프로필 '{profile}' 수집 실패: {e}")
+            return None
+    
+    if len(profiles) == 1:
+        return [run(profiles[0])]
+    with ThreadPoolExecutor(max_workers=min(PROFILE_WORKERS, len(profiles)), thread_name_prefix='chrome-profile') as executor:
+        return list(executor.map(run, profiles))
+
+def add_domain_categories(records):
+    """레코드들의 url을 도메인 규칙으로 한 번에 분류해 'category' 필드 추가 (같은 URL은 한 번만 파싱)"""
+    urls = pd.Series([record.get('url') for record in records], dtype=object)
+    for record, category in zip(records, get_categorizers().domains.categorize_series(urls)):
+        record['category'] = category
+    return records
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_JSON_NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+_JSON_CONSTANTS = {'true': True, 'false': False, 'null': None,
+                   'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf')}
+
+def _loads_json_iterative(text, object_hook=None):
+    """재귀 없이 명시적 스택으로 JSON 문자열 파싱 (json 모듈 디코더의 재귀 한도를 넘는 깊은 중첩용)
+    
+    문자열은 json 모듈의 scanstring으로 해석하므로 json.loads와 같은 값을 만들며, 구문 오류는 JSONDecodeError
+    """
+    def skip(pos):
+        return _JSON_WHITESPACE.match(text, pos).end()
+    
+    def read_key(pos):
+        """pos의 '"키":' 를 읽고 (키, 값 시작 위치) 반환"""
+        if text[pos:pos + 1] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+        key, pos = json.decoder.scanstring(text, pos + 1)
+        pos = skip(pos)
+        if text[pos:pos + 1] != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+        return key, skip(pos + 1)
+    
+    def finish(container):
+        return object_hook(container) if object_hook and isinstance(container, dict) else container
+    
+    # [열린 컨테이너, 다음 값이 들어갈 키] 스택
+    stack = []
+    pos = skip(0)
+    while True:
+        # 값 하나 읽기 (컨테이너를 열면 스택에 올리고 첫 값부터 다시 읽음)
+        char = text[pos:pos + 1]
+        if char in ('{', '['):
+            container = {} if char == '{' else []
+            pos = skip(pos + 1)
+            if text[pos:pos + 1] == ('}' if char == '{' else ']'):
+                value = finish(container)
+                pos += 1
+            else:
+                key = None
+                if char == '{':
+                    key, pos = read_key(pos)
+                stack.append([container, key])
+                continue
+        elif char == '"':
+            value, pos = json.decoder.scanstring(text, pos + 1)
+        else:
+            number = _JSON_NUMBER.match(text, pos)
+            if number:
+                integer, fraction, exponent = number.groups()
+                value = float(integer + (fraction or '') + (exponent or '')) if fraction or exponent else int(integer)
+                pos = number.end()
+            else:
+                for literal, constant in _JSON_CONSTANTS.items():
+                    if text.startswith(literal, pos):
+                        value = constant
+                        pos += len(literal)
+                        break
+                else:
+                    raise json.JSONDecodeError("Expecting value", text, pos)
+        
+        # 읽은 값을 부모 컨테이너에 넣고, 닫히는 컨테이너는 값으로 삼아 위로 올라감
+        while True:
+            pos = skip(pos)
+            if not stack:
+                if pos != len(text):
+                    raise json.JSONDecodeError("Extra data", text, pos)
+                return value
+            
+            container, key = stack[-1]
+            if isinstance(container, list):
+                container.append(value)
+            else:
+                container[key] = value
+            
+            char = text[pos:pos + 1]
+            if char == ',':
+                pos = skip(pos + 1)
+                if isinstance(container, dict):
+                    stack[-1][1], pos = read_key(pos)
+                break
+            if char != (']' if isinstance(container, list) else '}'):
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+            stack.pop()
+            value = finish(container)
+            pos += 1
+
 class ChromeBookmarkCollector:
     def __init__(self):
+        self.user_data_dir = get_chrome_user_data_dir()
+        self.profiles = discover_chrome_profiles(self.user_data_dir)
         self.chrome_paths = self._get_chrome_paths()
     
-    def _get_chrome_paths(self):
-        """운영체제별 Chrome 데이터 경로 반환"""
-        system = platform.system()
-        if system == "Windows":
-            base_path = os.path.expanduser("~\\AppData\\Local\\Google\\Chrome\\User Data")
-        elif system == "Darwin":  # macOS
-            base_path = os.path.expanduser("~/Library/Application Support/Google/Chrome")
-        else:  # Linux
-            base_path = os.path.expanduser("~/.config/google-chrome")
-        
+    def _get_chrome_paths(self, profile='Default'):
+        """프로필별 Chrome 데이터 경로 반환"""
+        profile_path = os.path.join(get_chrome_user_data_dir(), profile)
         return {
-            'bookmarks': os.path.join(base_path, "Default", "Bookmarks"),
-            'history': os.path.join(base_path, "Default", "History")
+            'bookmarks': os.path.join(profile_path, "Bookmarks"),
+            'history': os.path.join(profile_path, "History"),
+            'extensions': os.path.join(profile_path, "Extensions")
         }
     
     def extract_bookmarks(self, start_date=None, end_date=None, include_folders=True):
-        """Chrome 북마크 추출 (AWS 환경에서는 샘플 데이터 반환)"""
+        """모든 Chrome 프로필의 북마크를 병렬로 추출 (AWS 환경 또는 북마크 파일이 없으면 샘플 데이터 반환)"""
         # AWS 환경에서는 Chrome이 설치되어 있지 않으므로 샘플 데이터 반환
         if not os.path.exists(os.path.expanduser("~")):
             return self._get_sample_bookmarks()
-            
-        bookmarks_file = self.chrome_paths['bookmarks']
         
-        if not os.path.exists(bookmarks_file):
+        profiles = [profile for profile in self.profiles if os.path.exists(self._get_chrome_paths(profile)['bookmarks'])]
+        if not profiles:
             # Chrome 북마크 파일이 없으면 샘플 데이터 반환
             return self._get_sample_bookmarks()
         
-        with open(bookmarks_file, 'r', encoding='utf-8') as f:
-            bookmarks_data = json.load(f)
+        # 프로필별 실패를 격리하도록 각 프로필의 북마크는 작업 스레드 안에서 끝까지 읽어 목록으로 모음
+        results = run_per_profile(
+            lambda profile: list(self.iter_bookmarks(start_date, end_date, include_folders, profile)),
+            profiles
+        )
+        if all(bookmarks is None for bookmarks in results):
+            # 모든 프로필이 실패하면 호출한 쪽에서 샘플 데이터로 대체하도록 실패를 알림
+            raise RuntimeError("모든 Chrome 프로필의 북마크 파일을 읽지 못했습니다")
+        return add_domain_categories([bookmark for bookmarks in results if bookmarks for bookmark in bookmarks])
+    
+    def iter_bookmarks(self, start_date=None, end_date=None, include_folders=True, profile='Default'):
+        """프로필 하나의 Chrome 북마크를 하나씩 생성하는 제너레이터
         
-        bookmarks = []
+        파일은 한 번에 파싱하고(깊은 중첩은 재귀 없는 파서로) 트리는 재귀 없이 명시적 스택으로 순회
+        """
+        bookmarks_file = self._get_chrome_paths(profile)['bookmarks']
         
-        def extract_from_folder(folder, folder_path=""):
-            for item in folder.get('children', []):
-                if item['type'] == 'folder':
-                    if include_folders:
-                        new_path = f"{folder_path}/{item['name']}" if folder_path else item['name']
-                        extract_from_folder(item, new_path)
-                else:
-                    # URL 북마크
-                    date_added = datetime.fromtimestamp(int(item['date_added']) / 1000000 - 11644473600)
-                    
-                    # 날짜 필터링
-                    if start_date and date_added < datetime.strptime(start_date, '%Y-%m-%d'):
-                        continue
-                    if end_date and date_added > datetime.strptime(end_date, '%Y-%m-%d'):
-                        continue
-                    
-                    bookmarks.append({
-                        'title': item['name'],  # application.py에서 'title' 필드 사용
-                        'url': item['url'],
-                        'folder': folder_path,
-                        'date_added': date_added.isoformat()
-                    })
-        
-        # 북마크 바와 기타 북마크에서 추출
+        if not os.path.exists(bookmarks_file):
+            # Chrome 북마크 파일이 없으면 샘플 데이터 반환
+            yield from self._get_sample_bookmarks()
+            return
+        
+        # 날짜 범위를 Chrome 타임스탬프(1601-01-01 기준 마이크로초)로 한 번만 변환
+        start_timestamp = self._to_chrome_timestamp(start_date) if start_date else None
+        end_timestamp = self._to_chrome_timestamp(end_date) if end_date else None
+        
+        # 파싱하면서 북마크 노드에서 필요한 필드만 남겨 파싱 후 유지되는 트리 크기 절감
+        # (파일 전체 문자열과 각 노드 dict는 먼저 만들어지므로 최대 메모리 사용량은 줄지 않음)
+        with open(bookmarks_file, 'r', encoding='utf-8') as f:
+            bookmarks_text = f.read()
+        try:
+            bookmarks_data = json.loads(bookmarks_text, object_hook=self._slim_bookmark_node)
+        except RecursionError:
+            # json 모듈의 디코더는 재귀적이라 폴더가 아주 깊게 중첩되면 한도를 넘으므로 반복 파서로 다시 읽음
+            bookmarks_data = _loads_json_iterative(bookmarks_text, object_hook=self._slim_bookmark_node)
+        del bookmarks_text
+        
+        # 북마크 바와 기타 북마크에서 추출 (파일에 기록된 순서 유지)
         roots = bookmarks_data.get('roots', {})
         for root_name, root_data in roots.items():
-            if root_name in ['bookmark_bar', 'other']:
-                extract_from_folder(root_data, root_name)
-        
-        return bookmarks
+            if root_name not in ['bookmark_bar', 'other']:
+                continue
+            
+            # (자식 노드 반복자, 폴더 경로) 스택으로 깊이 우선 순회
+            stack = [(iter(root_data.get('children', [])), root_name)]
+            while stack:
+                children, folder_path = stack[-1]
+                item = next(children, None)
+                if item is None:
+                    stack.pop()
+                    continue
+                
+                if item.get('type') == 'folder':
+                    if include_folders:
+                        new_path = f"{folder_path}/{item['name']}" if folder_path else item['name']
+                        stack.append((iter(item.get('children', [])), new_path))
+                    continue
+                
+                # URL 북마크 - 날짜 필터링은 원시 타임스탬프로 비교
+                date_added_raw = int(item['date_added'])
+                if start_timestamp is not None and date_added_raw < start_timestamp:
+                    continue
+                if end_timestamp is not None and date_added_raw > end_timestamp:
+                    continue
+                
+                date_added = datetime.fromtimestamp(date_added_raw / 1000000 - 11644473600)
+                yield {
+                    'title': item['name'],  # application.py에서 'title' 필드 사용
+                    'url': item['url'],
+                    'folder': folder_path,
+                    'date_added': date_added.isoformat(),
+                    'profile': profile
+                }
+    
+    @staticmethod
+    def _to_chrome_timestamp(date_string):
+        """'YYYY-MM-DD' 날짜를 Chrome 타임스탬프(마이크로초)로 변환"""
+        date_value = datetime.strptime(date_string, '%Y-%m-%d')
+        return int((date_value.timestamp() + 11644473600) * 1000000)
+    
+    @staticmethod
+    def _slim_bookmark_node(node):
+        """json.load object_hook - 북마크/폴더 노드에서 사용하지 않는 필드(guid, meta_info 등) 제거"""
+        if 'type' in node:
+            return {key: node[key] for key in ('type', 'name', 'url', 'date_added', 'children') if key in node}
+        return node
     
     def get_chrome_extensions(self):
         """Chrome 확장 프로그램 목록 수집"""
         try:
-            # Chrome 확장 프로그램 경로
-            system = platform.system()
-            if system == "Windows":
-                extensions_path = os.path.expanduser("~\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\Extensions")
-            elif system == "Darwin":  # macOS
-                extensions_path = os.path.expanduser("~/Library/Application Support/Google/Chrome/Default/Extensions")
-            else:  # Linux
-                extensions_path = os.path.expanduser("~/.config/google-chrome/Default/Extensions")
-            
-            if not os.path.exists(extensions_path):
+            # 확장 프로그램 폴더가 있는 프로필
+            profiles = [profile for profile in self.profiles if os.path.exists(self._get_chrome_paths(profile)['extensions'])]
+            
+            if not profiles:
+                return self._get_sample_extensions()
+            
+            def scan_profile(profile):
+                """프로필의 확장 프로그램별 최신 버전 폴더 (확장 ID, 버전 폴더 경로, 수정 시각) 목록 - 버전은 숫자 단위로 비교"""
+                profile_targets = []
+                with os.scandir(self._get_chrome_paths(profile)['extensions']) as it:
+                    for ext_entry in it:
+                        if not ext_entry.is_dir():
+                            continue
+                        with os.scandir(ext_entry.path) as version_entries:
+                            versions = [v for v in version_entries if v.is_dir()]
+                        if versions:
+                            latest_version = max(versions, key=lambda v: _version_key(v.name))
+                            profile_targets.append((ext_entry.name, latest_version.path, latest_version.stat().st_mtime_ns))
+                return profile_targets
+            
+            # 프로필별로 따로 훑어 읽을 수 없는 프로필은 건너뜀 (모두 실패하면 샘플 데이터)
+            scanned = run_per_profile(scan_profile, profiles)
+            if all(profile_targets is None for profile_targets in scanned):
                 return self._get_sample_extensions()
             
+            targets = []
+            target_profiles = []
+            for profile, profile_targets in zip(profiles, scanned):
+                for target in profile_targets or []:
+                    targets.append(target)
+                    target_profiles.append(profile)
+            
+            # 모든 프로필의 manifest.json을 한 스레드 풀에서 병렬로 읽고, 버전 폴더가 바뀌지 않은 확장 프로그램은 캐시 사용
+            with ThreadPoolExecutor(max_workers=EXTENSION_READ_WORKERS) as executor:
+                manifests = list(executor.map(lambda target: _read_extension_manifest(*target), targets))
+            
             extensions = []
-            for ext_id in os.listdir(extensions_path):
-                ext_path = os.path.join(extensions_path, ext_id)
-                if os.path.isdir(ext_path):
-                    # 가장 최신 버전 폴더 찾기
-                    versions = [v for v in os.listdir(ext_path) if os.path.isdir(os.path.join(ext_path, v))]
-                    if versions:
-                        latest_version = max(versions)
-                        manifest_path = os.path.join(ext_path, latest_version, "manifest.json")
-                        
-                        if os.path.exists(manifest_path):
-                            try:
-                                with open(manifest_path, 'r', encoding='utf-8') as f:
-                                    manifest = json.load(f)
-                                
-                                extensions.append({
-                                    'id': ext_id,
-                                    'name': manifest.get('name', 'Unknown Extension'),
-                                    'version': manifest.get('version', 'Unknown'),
-                                    'description': manifest.get('description', ''),
-                                    'permissions': manifest.get('permissions', []),
-                                    'category': self._categorize_extension(manifest.get('name', ''))
-                                })
-                            except:
-                                continue
+            for (ext_id, _, _), profile, manifest in zip(targets, target_profiles, manifests):
+                if manifest is None:
+                    continue
+                extensions.append({
+                    'id': ext_id,
+                    'name': manifest.get('name', 'Unknown Extension'),
+                    'version': manifest.get('version', 'Unknown'),
+                    'description': manifest.get('description', ''),
+                    'permissions': manifest.get('permissions', []),
+                    'category': None,
+                    'profile': profile
+                })
+            
+            # 수집이 끝난 뒤 이름 컬럼 전체를 한 번에 분류
+            names = pd.Series([extension['name'] for extension in extensions], dtype=object)
+            for extension, category in zip(extensions, get_categorizers().extensions.categorize_series(names)):
+                extension['category'] = category
+            
+            # 이번 수집에서 보이지 않은 (삭제/업데이트된) 확장 프로그램 캐시 정리
+            live_keys = set(targets)
+            with _manifest_cache_lock:
+                for key in [key for key in _manifest_cache if key not in live_keys]:
+                    del _manifest_cache[key]
             
             return extensions
         except Exception as e:
@@ -154,29 +506,12 @@ class ChromeBookmarkCollector:
     
     def _categorize_extension(self, extension_name):
         """확장 프로그램을 카테고리별로 분류"""
-        name_lower = extension_name.lower()
-        
-        categories = {
-            'development': ['postman', 'redux', 'react', 'vue', 'github', 'devtools', 'json', 'api'],
-            'productivity': ['notion', 'todoist', 'evernote', 'pocket', 'grammarly', 'metamask'],
-            'privacy': ['ublock', 'adblock', 'ghostery', 'privacy badger', 'disconnect'],
-            'security': ['lastpass', '1password', 'bitwarden', 'dashlane', 'keeper'],
-            'shopping': ['honey', 'rakuten', 'capital one', 'paypal', 'amazon'],
-            'accessibility': ['dark reader', 'mercury reader', 'stylus', 'zoom'],
-            'social': ['facebook', 'twitter', 'linkedin', 'pinterest', 'instagram'],
-            'media': ['youtube', 'netflix', 'spotify', 'soundcloud', 'twitch']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in name_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        return get_categorizers().extensions.categorize(extension_name)
     
     def _get_sample_bookmarks(self):
         """샘플 북마크 데이터 반환 (2025년 상반기 데이터)"""
         base_date = datetime(2025, 1, 1)
-        return [
+        bookmarks = [
             # 1월 북마크
             {'title': 'ChatGPT', 'url': 'https://chat.openai.com', 'folder': 'AI Tools', 'date_added': (base_date + timedelta(days=5)).isoformat()},
             {'title': 'Claude AI', 'url': 'https://claude.ai', 'folder': 'AI Tools', 'date_added': (base_date + timedelta(days=10)).isoformat()},
@@ -202,74 +537,301 @@ class ChromeBookmarkCollector:
             {'title': 'Netflix', 'url': 'https://netflix.com', 'folder': 'Entertainment', 'date_added': (base_date + timedelta(days=132)).isoformat()},
             {'title': 'Amazon', 'url': 'https://amazon.com', 'folder': 'Shopping', 'date_added': (base_date + timedelta(days=138)).isoformat()}
         ]
+        return add_domain_categories(bookmarks)
 
 class BrowserHistoryCollector:
     def __init__(self):
-        self.chrome_paths = ChromeBookmarkCollector()._get_chrome_paths()
+        self._chrome = ChromeBookmarkCollector()
+        self.profiles = self._chrome.profiles
+        self.chrome_paths = self._chrome.chrome_paths
     
-    def get_browser_history(self, days_back=30):
-        """브라우저 히스토리 수집 (AWS 환경에서는 샘플 데이터 반환)"""
-        history_file = self.chrome_paths['history']
+    def _history_files(self):
+        """히스토리 파일이 있는 (프로필, 파일 경로) 목록"""
+        history_files = [(profile, self._chrome._get_chrome_paths(profile)['history']) for profile in self.profiles]
+        return [(profile, path) for profile, path in history_files if os.path.exists(path)]
+    
+    def get_browser_history(self, days_back=30, state_path=None):
+        """모든 Chrome 프로필의 브라우저 히스토리를 병렬로 수집 (AWS 환경에서는 샘플 데이터 반환)
+        
+        state_path를 지정하면 증분 모드로 동작: 프로필마다 이전 수집 이후 변경된 행만 Chrome에서 읽어
+        state_path의 SQLite 데이터셋에 병합한 뒤 기간 내 전체 히스토리를 반환
+        """
+        history, _ = self._collect_history(days_back, state_path, with_activity=False)
+        return history
+    
+    def get_history_with_activity(self, days_back=30, state_path=None):
+        """히스토리와 방문 1회 단위 (날짜, 시간대)별 집계를 함께 수집해 (히스토리, 방문 활동) 반환
         
-        if not os.path.exists(history_file):
+        프로필마다 히스토리 DB를 한 번만 열고(잠겨 있으면 복사도 한 번) 같은 스냅샷에서 두 쿼리를 실행
+        """
+        return self._collect_history(days_back, state_path, with_activity=True)
+    
+    def _collect_history(self, days_back, state_path, with_activity):
+        """프로필별 히스토리(와 방문 활동 집계)를 병렬로 수집 - 모든 프로필이 실패하면 샘플 히스토리"""
+        history_files = self._history_files()
+        
+        if not history_files:
             # Chrome 히스토리 파일이 없으면 샘플 데이터 반환
-            return self._get_sample_history()
+            return self._get_sample_history(), []
+        
+        # 지정된 일수만큼의 히스토리 가져오기
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        cutoff_timestamp = int(cutoff_date.timestamp() * 1000000) + 11644473600000000
+        
+        if state_path:
+            self._prepare_state(state_path)
+        
+        def collect_profile(profile_file):
+            profile, history_file = profile_file
+            
+            def read_history(cursor):
+                if state_path:
+                    rows = self._collect_incremental(cursor, cutoff_timestamp, state_path, profile)
+                else:
+                    query = """
+                    SELECT url, title, visit_count, last_visit_time
+                    FROM urls 
+                    WHERE last_visit_time > ?
+                    ORDER BY last_visit_time DESC
+                    """
+                    
+                    cursor.execute(query, (cutoff_timestamp,))
+                    rows = cursor.fetchall()
+                activity = self._read_visit_activity(cursor, cutoff_timestamp) if with_activity else []
+                return rows, activity
+            
+            rows, activity = self._read_history_db(history_file, read_history)
+            return (
+                [(profile, row) for row in rows],
+                [{'date': visit_date, 'hour': hour, 'visit_count': visit_count, 'profile': profile}
+                 for visit_date, hour, visit_count in activity]
+            )
+        
+        results = run_per_profile(collect_profile, history_files)
+        if all(result is None for result in results):
+            return self._get_sample_history(), []
+        results = [result for result in results if result is not None]
         
-        # 히스토리 파일 복사 (Chrome이 사용 중일 수 있음)
-        temp_history = "temp_history.db"
+        # 프로필을 합친 뒤 최근 방문 순으로 정렬
+        rows = [row for profile_rows, _ in results for row in profile_rows]
+        if len(history_files) > 1:
+            rows.sort(key=lambda profile_row: profile_row[1][3], reverse=True)
+        history = add_domain_categories([self._history_row_to_dict(row, profile) for profile, row in rows])
+        return history, [row for _, activity in results for row in activity]
+    
+    def _read_history_db(self, history_file, reader):
+        """Chrome 히스토리 DB를 복사 없이 읽기 전용으로 열어 reader(cursor) 실행
+        
+        immutable 없이 열어 SQLite의 잠금/변경 감지를 그대로 사용하고, 읽기 트랜잭션을 먼저 시작해
+        reader의 여러 쿼리가 같은 스냅샷을 읽음. 실행 중인 Chrome은 DB를 배타적으로 잠그고 있으므로
+        잠금을 기다리지 않고(HISTORY_LOCK_TIMEOUT, 기본 0초) 곧바로 고유한 이름의 임시 복사본을 읽음.
+        reader 안에서 난 오류(증분 상태 DB 잠금 등)는 복사본으로 재시도하지 않고 그대로 전달
+        """
+        conn = self._open_history_snapshot(history_file)
+        if conn is not None:
+            try:
+                return reader(conn.cursor())
+            finally:
+                conn.close()
+        
+        fd, temp_history = tempfile.mkstemp(prefix='chrome_history_', suffix='.db')
+        os.close(fd)
         try:
             shutil.copy2(history_file, temp_history)
-        except:
-            return self._get_sample_history()
+            conn = sqlite3.connect(temp_history)
+            try:
+                return reader(conn.cursor())
+            finally:
+                conn.close()
+        finally:
+            try:
+                os.remove(temp_history)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _open_history_snapshot(history_file):
+        """히스토리 DB를 읽기 전용으로 열고 읽기 트랜잭션 시작 (Chrome이 잠가 읽을 수 없으면 None)"""
+        uri = Path(history_file).as_uri() + '?mode=ro'
+        conn = None
+        try:
+            conn = sqlite3.connect(uri, uri=True, timeout=HISTORY_LOCK_TIMEOUT)
+            # 트랜잭션이 끝날 때까지 공유 잠금을 유지하므로 잠금 여부는 여기서 한 번만 확인
+            conn.execute("BEGIN")
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            return conn
+        except sqlite3.OperationalError as e:
+            if conn is not None:
+                conn.close()
+            print(f"⚠️ 히스토리 DB 직접 읽기 실패, 임시 복사본 사용: {e}")
+            return None
+    
+    def get_visit_activity(self, days_back=30):
+        """visits 테이블을 urls와 조인하여 방문 1회 단위로 (날짜, 시간대)별 방문 수 집계
+        
+        URL별 마지막 방문 시각에 visit_count 전체를 몰아주는 대신 실제 방문 시각을 사용하며,
+        집계는 visit_time 인덱스를 타는 SQLite 쿼리 안에서 프로필별로 수행. 히스토리 파일이 없으면 빈 목록 반환.
+        히스토리도 함께 필요하면 DB를 한 번만 여는 get_history_with_activity 사용
+        """
+        history_files = self._history_files()
+        if not history_files:
+            return []
+        
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        cutoff_timestamp = int(cutoff_date.timestamp() * 1000000) + 11644473600000000
+        
+        def collect_profile(profile_file):
+            profile, history_file = profile_file
+            activity = self._read_history_db(history_file, lambda cursor: self._read_visit_activity(cursor, cutoff_timestamp))
+            return [
+                {'date': visit_date, 'hour': hour, 'visit_count': visit_count, 'profile': profile}
+                for visit_date, hour, visit_count in activity
+            ]
+        
+        # 프로필별로 병렬 집계 (실패한 프로필은 제외)
+        results = run_per_profile(collect_profile, history_files)
+        return [row for rows in results if rows for row in rows]
+    
+    @staticmethod
+    def _read_visit_activity(cursor, cutoff_timestamp):
+        """기준 시각 이후 방문을 (날짜, 시간, 방문 수) 행으로 집계"""
+        query = """
+        SELECT date(v.visit_time / 1000000 - 11644473600, 'unixepoch', 'localtime') AS visit_date,
+               CAST(strftime('%H', v.visit_time / 1000000 - 11644473600, 'unixepoch', 'localtime') AS INTEGER) AS hour,
+               COUNT(*) AS visit_count
+        FROM visits v
+        JOIN urls u ON u.id = v.url
+        WHERE v.visit_time > ?
+        GROUP BY visit_date, hour
+        ORDER BY visit_date, hour
+        """
+        cursor.execute(query, (cutoff_timestamp,))
+        return cursor.fetchall()
+    
+    def _history_row_to_dict(self, row, profile='Default'):
+        """(url, title, visit_count, last_visit_time) 행을 히스토리 레코드로 변환"""
+        url, title, visit_count, last_visit_time = row
+        # Chrome 타임스탬프를 Python datetime으로 변환
+        visit_date = datetime.fromtimestamp((last_visit_time - 11644473600000000) / 1000000)
         
+        return {
+            'url': url,
+            'title': title or 'No Title',
+            'visit_count': visit_count,
+            'last_visit': visit_date.isoformat(),
+            'domain': url.split('/')[2] if len(url.split('/')) > 2 else url,
+            'profile': profile
+        }
+    
+    @staticmethod
+    def _prepare_state(state_path):
+        """증분 수집 상태 DB 테이블 준비 (프로필 구분 이전 형식이면 버리고 다음 수집에서 전체 재수집)"""
+        state = sqlite3.connect(state_path, timeout=30)
         try:
-            conn = sqlite3.connect(temp_history)
-            cursor = conn.cursor()
+            columns = [row[1] for row in state.execute("PRAGMA table_info(history)")]
+            if columns and 'profile' not in columns:
+                state.execute("DROP TABLE history")
+                state.execute("DROP TABLE IF EXISTS meta")
             
-            # 지정된 일수만큼의 히스토리 가져오기
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            cutoff_timestamp = int(cutoff_date.timestamp() * 1000000) + 11644473600000000
+            state.execute("""
+            CREATE TABLE IF NOT EXISTS history (
+                profile TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                url TEXT,
+                title TEXT,
+                visit_count INTEGER,
+                last_visit_time INTEGER,
+                PRIMARY KEY (profile, id)
+            )""")
+            state.execute("CREATE INDEX IF NOT EXISTS history_last_visit ON history (profile, last_visit_time)")
+            state.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                profile TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER,
+                PRIMARY KEY (profile, key)
+            )""")
+            state.commit()
+        finally:
+            state.close()
+    
+    def _collect_incremental(self, cursor, cutoff_timestamp, state_path, profile='Default'):
+        """프로필의 마지막으로 반영한 last_visit_time(워터마크) 이후의 행만 읽어 저장된 데이터셋에 병합
+        
+        사용자가 Chrome에서 삭제한 URL이 남지 않도록 매번 기간 내 id 목록으로 저장된 행을 대조해 제거
+        """
+        # 여러 프로필이 같은 상태 DB에 동시에 쓰므로 잠금 대기 시간을 넉넉히 설정
+        state = sqlite3.connect(state_path, timeout=30)
+        try:
+            meta = dict(state.execute("SELECT key, value FROM meta WHERE profile = ?", (profile,)).fetchall())
             
-            query = """
-            SELECT url, title, visit_count, last_visit_time
-            FROM urls 
+            watermark = meta.get('watermark')
+            coverage_start = meta.get('coverage_start')
+            
+            # Chrome의 최신 방문 시각이 워터마크보다 과거이면 히스토리가 삭제된 것이므로 전체 재수집
+            cursor.execute("SELECT MAX(last_visit_time) FROM urls")
+            source_latest = cursor.fetchone()[0] or 0
+            
+            # 처음 수집하거나 이전보다 긴 기간을 요청하면 전체 재수집, 아니면 워터마크 이후만 조회
+            full_reload = watermark is None or coverage_start is None or cutoff_timestamp < coverage_start or source_latest < watermark
+            if full_reload:
+                since = cutoff_timestamp
+                print(f"🔄 히스토리 전체 수집 ({profile})")
+            else:
+                since = max(watermark, cutoff_timestamp)
+            
+            # Chrome에서 먼저 읽은 뒤 상태 DB 쓰기 트랜잭션을 시작해 잠금 보유 시간 최소화
+            cursor.execute("""
+            SELECT id, url, title, visit_count, last_visit_time
+            FROM urls
             WHERE last_visit_time > ?
-            ORDER BY last_visit_time DESC
-            """
+            """, (since,))
+            new_rows = cursor.fetchall()
+            print(f"📥 히스토리 증분 수집 ({profile}): {len(new_rows)}개 행 반영")
             
-            cursor.execute(query, (cutoff_timestamp,))
-            results = cursor.fetchall()
+            # 기간 내 Chrome에 남아 있는 id (정수 기본 키만 읽으므로 행 전체를 읽는 것보다 가벼움)
+            live_ids = None
+            if not full_reload:
+                cursor.execute("SELECT id FROM urls WHERE last_visit_time > ?", (cutoff_timestamp,))
+                live_ids = {row[0] for row in cursor.fetchall()}
             
-            history = []
-            for row in results:
-                url, title, visit_count, last_visit_time = row
-                # Chrome 타임스탬프를 Python datetime으로 변환
-                visit_date = datetime.fromtimestamp((last_visit_time - 11644473600000000) / 1000000)
-                
-                history.append({
-                    'url': url,
-                    'title': title or 'No Title',
-                    'visit_count': visit_count,
-                    'last_visit': visit_date.isoformat(),
-                    'domain': url.split('/')[2] if len(url.split('/')) > 2 else url
-                })
+            if full_reload:
+                state.execute("DELETE FROM history WHERE profile = ?", (profile,))
+            else:
+                stored_ids = {row[0] for row in state.execute("SELECT id FROM history WHERE profile = ?", (profile,))}
+                deleted_ids = stored_ids - live_ids
+                if deleted_ids:
+                    print(f"🗑️ Chrome에서 삭제된 히스토리 제거 ({profile}): {len(deleted_ids)}개 행")
+                    state.executemany("DELETE FROM history WHERE profile = ? AND id = ?",
+                                      [(profile, history_id) for history_id in deleted_ids])
             
-            conn.close()
-            return history
+            # 재방문한 URL은 같은 id로 갱신되므로 교체 삽입
+            state.executemany(
+                "INSERT OR REPLACE INTO history (profile, id, url, title, visit_count, last_visit_time) VALUES (?, ?, ?, ?, ?, ?)",
+                [(profile,) + tuple(row) for row in new_rows]
+            )
+            state.execute("DELETE FROM history WHERE profile = ? AND last_visit_time <= ?", (profile, cutoff_timestamp))
             
-        except:
-            return self._get_sample_history()
+            new_watermark = max([since] + [row[4] for row in new_rows])
+            state.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?, ?)", [
+                (profile, 'watermark', new_watermark),
+                (profile, 'coverage_start', cutoff_timestamp)
+            ])
+            state.commit()
+            
+            return state.execute("""
+            SELECT url, title, visit_count, last_visit_time
+            FROM history
+            WHERE profile = ? AND last_visit_time > ?
+            ORDER BY last_visit_time DESC
+            """, (profile, cutoff_timestamp)).fetchall()
         finally:
-            if os.path.exists(temp_history):
-                try:
-                    os.remove(temp_history)
-                except:
-                    pass
+            state.close()
     
     def _get_sample_history(self):
         """샘플 히스토리 데이터 반환 (2025년 상반기 데이터)"""
         now = datetime.now()
-        return [
+        history = [
             # 최근 방문 (오늘)
             {'url': 'https://chat.openai.com', 'title': 'ChatGPT', 'visit_count': 45, 'last_visit': (now - timedelta(minutes=30)).isoformat(), 'domain': 'chat.openai.com'},
             {'url': 'https://github.com/trending', 'title': 'Trending repositories on GitHub', 'visit_count': 32, 'last_visit': (now - timedelta(hours=1)).isoformat(), 'domain': 'github.com'},
@@ -300,14 +862,24 @@ class BrowserHistoryCollector:
             {'url': 'https://medium.com/@developer/ai-trends-2025', 'title': 'AI Trends 2025 - Medium', 'visit_count': 7, 'last_visit': (now - timedelta(days=60)).isoformat(), 'domain': 'medium.com'},
             {'url': 'https://reddit.com/r/programming', 'title': 'r/programming - Reddit', 'visit_count': 29, 'last_visit': (now - timedelta(days=75)).isoformat(), 'domain': 'reddit.com'}
         ]
+        return add_domain_categories(history)
 
 class SystemInfoCollector:
-    def get_system_info(self):
-        """시스템 정보 수집 (환경에 따라 실제 데이터 또는 샘플 데이터)"""
+    def get_system_info(self, top_n=None, sort_by='cpu'):
+        """시스템 정보 수집 (환경에 따라 실제 데이터 또는 샘플 데이터)
+        
+        top_n: 포함할 상위 프로세스 수 (기본 TOP_PROCESS_COUNT)
+        sort_by: 상위 프로세스 정렬 기준 ('cpu' 또는 'memory')
+        """
+        if sort_by not in PROCESS_SORT_FIELDS:
+            raise ValueError(f"지원하지 않는 프로세스 정렬 기준입니다: {sort_by}")
+        if top_n is not None and (isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 0):
+            raise ValueError(f"상위 프로세스 수는 0 이상의 정수여야 합니다: {top_n!r}")
+        
         if PSUTIL_AVAILABLE and not is_aws_environment():
             # 로컬 환경: 실제 시스템 정보 수집
             try:
-                return self._get_real_system_info()
+                return self._get_real_system_info(top_n, sort_by)
             except Exception as e:
                 print(f"실제 시스템 정보 수집 실패, 샘플 데이터 사용: {e}")
                 return self._get_sample_system_info()
@@ -315,7 +887,7 @@ class SystemInfoCollector:
             # AWS 환경 또는 psutil 없음: 샘플 데이터 사용
             return self._get_sample_system_info()
     
-    def _get_real_system_info(self):
+    def _get_real_system_info(self, top_n=None, sort_by='cpu'):
         """실제 시스템 정보 수집"""
         system_info = []
         
@@ -335,10 +907,15 @@ class SystemInfoCollector:
             }
         ])
         
+        # 백그라운드 샘플러의 최근 측정값 사용 (시작되지 않았으면 여기서 시작하고 첫 측정까지만 대기)
+        cpu_sampler.start()
+        cpu_percent, process_samples, _ = cpu_sampler.snapshot(timeout=cpu_sampler.interval + 1)
+        
         # CPU 정보
         try:
             cpu_count = psutil.cpu_count()
-            cpu_percent = psutil.cpu_percent(interval=1)
+            if cpu_percent is None:
+                cpu_percent = psutil.cpu_percent(interval=None)
             system_info.extend([
                 {
                     'category': 'CPU',
@@ -410,30 +987,35 @@ class SystemInfoCollector:
         except:
             pass
         
-        # 실행 중인 프로세스 (상위 10개)
+        # 실행 중인 프로세스 (정렬 기준 상위 N개)
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'create_time']):
-                try:
-                    proc_info = proc.info
-                    if proc_info['cpu_percent'] is not None and proc_info['cpu_percent'] > 0:
-                        processes.append({
-                            'category': 'Process',
-                            'name': proc_info['name'],
-                            'value': f"PID: {proc_info['pid']}",
-                            'details': f"CPU: {proc_info['cpu_percent']:.1f}%, Memory: {proc_info['memory_percent']:.1f}%"
-                        })
-                except:
-                    continue
-            
-            # CPU 사용량 기준으로 정렬하여 상위 10개만
-            processes.sort(key=lambda x: float(x['details'].split('CPU: ')[1].split('%')[0]), reverse=True)
-            system_info.extend(processes[:10])
+            system_info.extend(self._top_process_entries(process_samples, top_n, sort_by))
         except:
             pass
         
         return system_info
     
+    @staticmethod
+    def _top_process_entries(process_samples, top_n=None, sort_by='cpu'):
+        """측정값 중 정렬 기준 상위 N개만 골라 시스템 정보 항목으로 변환"""
+        field = PROCESS_SORT_FIELDS[sort_by]
+        top_n = TOP_PROCESS_COUNT if top_n is None else top_n
+        
+        # CPU 기준은 실제로 CPU를 사용 중인 프로세스만 대상
+        candidates = (sample for sample in process_samples
+                      if getattr(sample, field) is not None and (sort_by != 'cpu' or sample.cpu_percent > 0))
+        top_processes = heapq.nlargest(top_n, candidates, key=lambda sample: getattr(sample, field))
+        
+        return [
+            {
+                'category': 'Process',
+                'name': sample.name,
+                'value': f"PID: {sample.pid}",
+                'details': f"CPU: {sample.cpu_percent or 0.0:.1f}%, Memory: {sample.memory_percent or 0.0:.1f}%"
+            }
+            for sample in top_processes
+        ]
+    
     def get_installed_programs(self):
         """설치된 프로그램 목록 수집 (Windows 레지스트리 기반)"""
         if platform.system() != 'Windows':
@@ -483,7 +1065,6 @@ class SystemInfoCollector:
                             except FileNotFoundError:
                                 program_info['install_date'] = "Unknown"
                             
-                            program_info['category'] = self._categorize_program(program_info['name'])
                             programs.append(program_info)
                             
                             winreg.CloseKey(subkey)
@@ -493,6 +1074,11 @@ class SystemInfoCollector:
                 except Exception:
                     continue
             
+            # 레지스트리 전체를 읽은 뒤 프로그램 이름을 한 번에 분류 (같은 이름은 한 번만 계산)
+            names = pd.Series([program['name'] for program in programs], dtype=object)
+            for program, category in zip(programs, get_categorizers().programs.categorize_series(names)):
+                program['category'] = category
+            
             return programs
         except Exception as e:
             print(f"설치된 프로그램 수집 실패: {e}")
@@ -592,70 +1178,107 @@ class SystemInfoCollector:
     
     def _categorize_program(self, program_name):
         """프로그램을 카테고리별로 분류"""
-        program_name_lower = program_name.lower()
-        
-        categories = {
-            'development': ['visual studio', 'code', 'python', 'java', 'git', 'node', 'npm', 'docker', 'intellij', 'eclipse', 'sublime', 'atom'],
-            'design': ['photoshop', 'illustrator', 'figma', 'sketch', 'canva', 'gimp', 'blender'],
-            'office': ['word', 'excel', 'powerpoint', 'outlook', 'teams', 'slack', 'notion', 'trello'],
-            'browser': ['chrome', 'firefox', 'safari', 'edge', 'opera'],
-            'media': ['spotify', 'youtube', 'vlc', 'media player', 'itunes', 'netflix'],
-            'communication': ['discord', 'telegram', 'whatsapp', 'zoom', 'skype', 'kakao'],
-            'gaming': ['steam', 'game', 'epic', 'origin', 'battle.net'],
-            'utility': ['winrar', 'zip', 'antivirus', 'cleaner', 'driver']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in program_name_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        return get_categorizers().programs.categorize(program_name)
+
+# 최근 사용 파일 최대 개수
+RECENT_FILES_LIMIT = int(os.getenv('RECENT_FILES_LIMIT', '30'))
+
+def get_recently_used_xbel_path():
+    """Linux 데스크톱(GTK) 최근 사용 파일 목록 경로 ($XDG_DATA_HOME/recently-used.xbel)"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(data_home, 'recently-used.xbel')
 
 class RecentFilesCollector:
     def get_recent_files(self, days_back=7):
-        """최근 사용한 파일 목록 수집 (Windows)"""
-        if platform.system() != 'Windows':
+        """최근 사용한 파일 목록 수집 (Windows: 최근 문서 바로가기, Linux: recently-used.xbel)"""
+        system = platform.system()
+        if system not in ('Windows', 'Linux'):
             return self._get_sample_recent_files()
         
         try:
-            recent_files = []
+            # 기준 시각은 한 번만 계산하고 수정 시각은 epoch 초(float) 그대로 비교
+            cutoff = time.time() - days_back * 86400
             
-            # Windows 최근 문서 폴더에서 파일 수집
-            recent_folder = os.path.expanduser("~\\AppData\\Roaming\\Microsoft\\Windows\\Recent")
+            if system == 'Windows':
+                # Windows 최근 문서 폴더에서 파일 수집
+                recent_folder = os.path.expanduser("~\\AppData\\Roaming\\Microsoft\\Windows\\Recent")
+                if not os.path.exists(recent_folder):
+                    return []
+                candidates = self._iter_windows_recent(recent_folder, cutoff)
+            else:
+                xbel_path = get_recently_used_xbel_path()
+                if not os.path.exists(xbel_path):
+                    return self._get_sample_recent_files()
+                candidates = self._iter_xbel_recent(xbel_path, cutoff)
             
-            if os.path.exists(recent_folder):
-                for filename in os.listdir(recent_folder):
-                    if filename.endswith('.lnk'):  # 바로가기 파일
-                        link_path = os.path.join(recent_folder, filename)
-                        try:
-                            # 바로가기 파일의 수정 시간 확인
-                            file_stat = os.stat(link_path)
-                            modified_time = datetime.fromtimestamp(file_stat.st_mtime)
-                            
-                            # 날짜 필터링
-                            cutoff_date = datetime.now() - timedelta(days=days_back)
-                            if modified_time >= cutoff_date:
-                                # 원본 파일명 추출 (확장자 제거)
-                                original_name = filename[:-4]  # .lnk 제거
-                                
-                                recent_files.append({
-                                    'name': original_name,
-                                    'link_path': link_path,
-                                    'extension': os.path.splitext(original_name)[1],
-                                    'modified': modified_time.isoformat(),
-                                    'category': self._categorize_file(original_name)
-                                })
-                        except:
-                            continue
+            # 전체 정렬 대신 최근 수정된 N개만 힙으로 선택
+            latest = heapq.nlargest(RECENT_FILES_LIMIT, candidates, key=lambda candidate: candidate[0])
+            
+            recent_files = []
+            for modified, name, link_path in latest:
+                recent_files.append({
+                    'name': name,
+                    'link_path': link_path,
+                    'extension': os.path.splitext(name)[1],
+                    'modified': datetime.fromtimestamp(modified).isoformat(),
+                    'category': None
+                })
             
-            # 수정 날짜 기준으로 정렬
-            recent_files.sort(key=lambda x: x['modified'], reverse=True)
-            return recent_files[:30]  # 최대 30개
+            # 남은 파일만 한 번에 분류
+            names = pd.Series([recent_file['name'] for recent_file in recent_files], dtype=object)
+            for recent_file, category in zip(recent_files, get_categorizers().files.categorize_series(names)):
+                recent_file['category'] = category
+            return recent_files
             
         except Exception as e:
             print(f"최근 파일 수집 실패: {e}")
             return self._get_sample_recent_files()
     
+    @staticmethod
+    def _iter_windows_recent(recent_folder, cutoff):
+        """기준 시각 이후 수정된 바로가기 (수정 시각, 원본 파일명, 바로가기 경로) - scandir가 캐시한 stat 사용"""
+        with os.scandir(recent_folder) as it:
+            for entry in it:
+                if not entry.name.endswith('.lnk'):  # 바로가기 파일
+                    continue
+                try:
+                    modified = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if modified >= cutoff:
+                    # 원본 파일명 추출 (확장자 제거)
+                    yield modified, entry.name[:-4], entry.path  # .lnk 제거
+    
+    @staticmethod
+    def _iter_xbel_recent(xbel_path, cutoff):
+        """recently-used.xbel에서 기준 시각 이후 사용된 로컬 파일 (수정 시각, 파일명, 파일 경로)
+        
+        iterparse로 <bookmark> 요소가 끝날 때마다 처리하고 바로 비워서 파일 크기와 무관하게 메모리 사용량 유지
+        """
+        context = ElementTree.iterparse(xbel_path, events=('start', 'end'))
+        _, root = next(context)
+        for event, element in context:
+            if event != 'end' or element.tag != 'bookmark':
+                continue
+            
+            href = element.get('href', '')
+            # 마지막 사용 시각: modified → visited → added 순으로 사용 (예: 2025-01-01T09:30:00.123456Z)
+            timestamp = element.get('modified') or element.get('visited') or element.get('added')
+            element.clear()
+            root.clear()  # 처리한 요소를 루트에서 떼어 내 트리가 커지지 않도록 함
+            
+            if not href.startswith('file://') or not timestamp:
+                continue
+            try:
+                modified = datetime.fromisoformat(timestamp).timestamp()
+            except ValueError:
+                continue
+            if modified < cutoff:
+                continue
+            
+            path = unquote(urlsplit(href).path)
+            yield modified, os.path.basename(path), path
+    
     def _get_sample_recent_files(self):
         """샘플 최근 파일 목록"""
         now = datetime.now()
@@ -674,24 +1297,7 @@ class RecentFilesCollector:
     
     def _categorize_file(self, file_path):
         """파일을 카테고리별로 분류"""
-        extension = os.path.splitext(file_path)[1].lower()
-        
-        categories = {
-            'document': ['.docx', '.doc', '.pdf', '.txt', '.rtf', '.odt', '.pages'],
-            'spreadsheet': ['.xlsx', '.xls', '.csv', '.ods', '.numbers'],
-            'presentation': ['.pptx', '.ppt', '.odp', '.key'],
-            'code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.ts', '.jsx', '.vue', '.json', '.xml', '.yaml', '.yml'],
-            'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff', '.ico'],
-            'media': ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.mp3', '.wav', '.flac', '.aac'],
-            'archive': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'],
-            'design': ['.psd', '.ai', '.sketch', '.fig', '.xd', '.indd']
-        }
-        
-        for category, extensions in categories.items():
-            if extension in extensions:
-                return category
-        
-        return 'other'
+        return get_categorizers().files.categorize(file_path)
 
 class NetworkInfoCollector:
     def get_network_info(self):
@@ -0,0 +1,188 @@
+"""
+수집 데이터셋 카탈로그 모듈
+수집된 파일의 종류, 경로, 행 수, 생성 시각, 스키마를 SQLite에 기록하여
+"종류별 최신 파일"을 디렉토리 스캔 없이 조회
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+# 파일명 접두어로 구분되는 데이터셋 종류 (예: bookmarks_20250101_120000.csv)
+DATASET_KINDS = (
+    'bookmarks',
+    'browser_history',
+    'visit_activity',
+    'system_info',
+    'chrome_extensions',
+    'recent_files',
+    'network_info',
+    'installed_programs',
+    'ai_analysis'
+)
+
+# 카탈로그에 등록되는 파일 확장자 (컬럼 형식 데이터셋, CSV 사본, AI 분석 결과)
+DATASET_FILE_EXTENSIONS = ('.parquet', '.npz', '.csv', '.json')
+
+CATALOG_FILENAME = 'catalog.db'
+
+class DatasetCatalog:
+    """데이터셋 등록/조회 카탈로그 (종류별 최신 항목은 별도 테이블로 O(1) 조회)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        is_new = not os.path.exists(db_path)
+        with self._connect() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS datasets (
+                path TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                row_count INTEGER,
+                created_at REAL NOT NULL,
+                schema TEXT,
+                summary TEXT
+            )""")
+            # 요약 컬럼 도입 이전에 만들어진 카탈로그 호환
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(datasets)")]
+            if 'summary' not in columns:
+                conn.execute("ALTER TABLE datasets ADD COLUMN summary TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS datasets_kind_created ON datasets (kind, created_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS latest (kind TEXT PRIMARY KEY, path TEXT NOT NULL)")
+
+        # 카탈로그 도입 이전에 수집된 파일이 있으면 한 번만 스캔하여 등록
+        if is_new:
+            self.rebuild(os.path.dirname(db_path))
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def register(self, kind: str, path: str, row_count: Optional[int] = None,
+                 schema: Optional[List[Dict[str, str]]] = None, created_at: Optional[float] = None,
+                 summary: Optional[Dict[str, Any]] = None):
+        """데이터셋 등록 후 해당 종류의 최신 항목으로 지정"""
+        path = os.path.abspath(path)
+        created_at = created_at if created_at is not None else time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO datasets (path, kind, row_count, created_at, schema, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, kind, row_count, created_at, _dump_json(schema), _dump_json(summary))
+            )
+            self._refresh_latest(conn, kind)
+
+    def set_summary(self, path: str, summary: Dict[str, Any]):
+        """등록된 데이터셋의 요약 스냅샷 저장"""
+        with self._connect() as conn:
+            conn.execute("UPDATE datasets SET summary = ? WHERE path = ?", (_dump_json(summary), os.path.abspath(path)))
+
+    def latest(self, kind: str) -> Optional[Dict[str, Any]]:
+        """종류별 최신 데이터셋 정보 반환 (파일이 외부에서 삭제되었으면 다음 항목으로 대체)"""
+        while True:
+            with self._connect() as conn:
+                row = conn.execute("""
+                SELECT d.path, d.kind, d.row_count, d.created_at, d.schema, d.summary
+                FROM latest l JOIN datasets d ON d.path = l.path
+                WHERE l.kind = ?
+                """, (kind,)).fetchone()
+
+            if row is None:
+                return None
+            if os.path.exists(row[0]):
+                return {
+                    'path': row[0],
+                    'kind': row[1],
+                    'row_count': row[2],
+                    'created_at': row[3],
+                    'schema': json.loads(row[4]) if row[4] else None,
+                    'summary': json.loads(row[5]) if row[5] else None
+                }
+            self.remove(row[0])
+
+    def latest_path(self, kind: str) -> Optional[str]:
+        """종류별 최신 데이터셋 경로 (없으면 None)"""
+        entry = self.latest(kind)
+        return entry['path'] if entry else None
+
+    def remove(self, path: str):
+        """데이터셋 등록 해제 (최신 항목이었으면 다음으로 최신인 항목으로 교체)"""
+        path = os.path.abspath(path)
+        with self._connect() as conn:
+            row = conn.execute("SELECT kind FROM datasets WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                return
+            conn.execute("DELETE FROM datasets WHERE path = ?", (path,))
+            self._refresh_latest(conn, row[0])
+
+    def clear(self):
+        """모든 등록 정보 삭제"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM datasets")
+            conn.execute("DELETE FROM latest")
+
+    def rebuild(self, uploads_dir: str):
+        """디렉토리를 스캔하여 파일명 접두어 기준으로 데이터셋 등록 (행 수/스키마는 미상)"""
+        try:
+            entries = list(os.scandir(uploads_dir))
+        except OSError:
+            return
+
+        candidates = {}
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            if not entry.is_file() or ext not in DATASET_FILE_EXTENSIONS:
+                continue
+            kind = dataset_kind_from_filename(entry.name)
+            if kind is None:
+                continue
+            # 같은 이름의 CSV 사본보다 컬럼 형식 파일을 우선 등록
+            if ext == '.csv' and stem in candidates:
+                continue
+            candidates[stem] = (entry, kind)
+
+        with self._connect() as conn:
+            for entry, kind in candidates.values():
+                conn.execute(
+                    "INSERT OR IGNORE INTO datasets (path, kind, created_at) VALUES (?, ?, ?)",
+                    (os.path.abspath(entry.path), kind, entry.stat().st_ctime)
+                )
+            for kind in DATASET_KINDS:
+                self._refresh_latest(conn, kind)
+
+    @staticmethod
+    def _refresh_latest(conn, kind: str):
+        row = conn.execute(
+            "SELECT path FROM datasets WHERE kind = ? ORDER BY created_at DESC LIMIT 1", (kind,)
+        ).fetchone()
+        if row is None:
+            conn.execute("DELETE FROM latest WHERE kind = ?", (kind,))
+        else:
+            conn.execute("INSERT OR REPLACE INTO latest VALUES (?, ?)", (kind, row[0]))
+
+def _dump_json(value) -> Optional[str]:
+    return json.dumps(value, ensure_ascii=False) if value else None
+
+def dataset_kind_from_filename(filename: str) -> Optional[str]:
+    """파일명 접두어로 데이터셋 종류 판별 (가장 긴 접두어 우선)"""
+    for kind in sorted(DATASET_KINDS, key=len, reverse=True):
+        if filename.startswith(f"{kind}_"):
+            return kind
+    return None
+
+def dataframe_schema(df) -> List[Dict[str, str]]:
+    """DataFrame 컬럼 스키마 (이름, dtype)"""
+    return [{'name': str(column), 'dtype': str(dtype)} for column, dtype in df.dtypes.items()]
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(uploads_dir: str) -> DatasetCatalog:
+    """업로드 디렉토리별 카탈로그 인스턴스 (프로세스 내 공유)"""
+    uploads_dir = os.path.abspath(uploads_dir)
+    with _catalogs_lock:
+        catalog = _catalogs.get(uploads_dir)
+        if catalog is None or not os.path.exists(catalog.db_path):
+            os.makedirs(uploads_dir, exist_ok=True)
+            catalog = DatasetCatalog(os.path.join(uploads_dir, CATALOG_FILENAME))
+            _catalogs[uploads_dir] = catalog
+        return catalog
@@ -0,0 +1,256 @@
+"""
+수집 데이터셋 저장/읽기 모듈
+수집 결과를 타입이 보존되는 컬럼 형식(Parquet, 없으면 NumPy .npz)으로 저장하고
+필요한 컬럼만 골라 읽을 수 있도록 제공 (CSV는 내보내기용으로 함께 저장 가능)
+"""
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+# Parquet 지원 여부 (pyarrow 필요)
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# 저장 형식: auto(Parquet 우선, 없으면 npz) / parquet / npz / csv
+DATASET_FORMAT = os.getenv('DATASET_FORMAT', 'auto').lower()
+# 컬럼 형식과 함께 CSV 사본도 저장할지 여부 (다운로드/외부 도구용)
+DATASET_CSV_EXPORT = os.getenv('DATASET_CSV_EXPORT', 'true').lower() not in ('0', 'false', 'no')
+# 파싱된 DataFrame 캐시 메모리 한도 (MB)
+DATAFRAME_CACHE_MAX_MB = int(os.getenv('DATAFRAME_CACHE_MAX_MB', '256'))
+
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'npz': '.npz', 'csv': '.csv'}
+DATASET_EXTENSIONS = tuple(FORMAT_EXTENSIONS.values())
+
+def resolve_format(fmt: Optional[str] = None) -> str:
+    """설정된 저장 형식을 실제 사용할 형식으로 변환"""
+    fmt = (fmt or DATASET_FORMAT).lower()
+    if fmt == 'auto' or (fmt == 'parquet' and not PARQUET_AVAILABLE):
+        return 'parquet' if PARQUET_AVAILABLE else 'npz'
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"지원하지 않는 데이터셋 형식입니다: {fmt}")
+    return fmt
+
+def write_dataset(df: pd.DataFrame, base_path: str, fmt: Optional[str] = None,
+                  csv_export: Optional[bool] = None) -> str:
+    """확장자 없는 경로에 데이터셋 저장 후 기본(읽기용) 파일 경로 반환"""
+    fmt = resolve_format(fmt)
+    csv_export = DATASET_CSV_EXPORT if csv_export is None else csv_export
+    path = base_path + FORMAT_EXTENSIONS[fmt]
+    df = normalize_object_columns(df)
+
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'npz':
+        _write_npz(df, path)
+
+    if fmt == 'csv' or csv_export:
+        df.to_csv(base_path + '.csv', index=False, encoding='utf-8-sig')
+    return path
+
+def normalize_object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열이 아닌 값(리스트, 숫자와 문자열 혼합 등)이 섞인 object 컬럼의 값을 문자열로 변환 (결측은 유지)
+
+    저장 형식과 관계없이 같은 데이터가 기록되도록 형식별 쓰기 전에 한 번만 적용
+    """
+    converted = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype != object:
+            continue
+        values = series.tolist()
+        mask = series.isna().tolist() if len(values) else []
+        if all(missing or isinstance(value, str) for value, missing in zip(values, mask)):
+            continue
+        converted[column] = pd.Series([None if missing else str(value) for value, missing in zip(values, mask)],
+                                      index=series.index, dtype=object)
+    return df.assign(**converted) if converted else df
+
+def dataset_file_group(path: str) -> List[str]:
+    """데이터셋 파일과 확장자만 다른 기본 파일/CSV 사본 중 존재하는 경로 (함께 하나의 데이터셋, 기본 형식 우선 순서)"""
+    stem, ext = os.path.splitext(path)
+    if ext not in DATASET_EXTENSIONS:
+        return [path] if os.path.exists(path) else []
+    return [stem + extension for extension in DATASET_EXTENSIONS if os.path.exists(stem + extension)]
+
+def read_dataset(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """확장자에 맞게 데이터셋 읽기. columns를 주면 존재하는 컬럼만 읽음"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [column for column in columns if column in available]
+        return pd.read_parquet(path, columns=columns)
+    if ext == '.npz':
+        return _read_npz(path, columns)
+    if columns is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        selected = [column for column in header if column in set(columns)]
+        if not selected and len(header):
+            # 요청한 컬럼이 하나도 없어도 행 수는 유지
+            return pd.read_csv(path, usecols=[header[0]]).iloc[:, :0]
+        return pd.read_csv(path, usecols=selected)
+    return pd.read_csv(path)
+
+def _write_npz(df: pd.DataFrame, path: str):
+    """컬럼별 배열로 저장 (숫자/불리언/날짜는 그대로, 나머지는 UTF-8 바이트 + 오프셋 + 결측 마스크)"""
+    arrays = {
+        '__columns__': np.array([str(column) for column in df.columns], dtype=str),
+        '__dtypes__': np.array([str(dtype) for dtype in df.dtypes], dtype=str),
+        '__rows__': np.array(len(df), dtype=np.int64)
+    }
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        key = f'c{i}'
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series) \
+                or pd.api.types.is_datetime64_dtype(series):
+            if series.hasnans and not pd.api.types.is_float_dtype(series) \
+                    and not pd.api.types.is_datetime64_dtype(series):
+                series = series.astype('float64')  # nullable 정수/불리언은 NaN이 표현되는 float로 저장
+            arrays[key] = series.to_numpy()
+            continue
+
+        mask = series.isna().to_numpy()
+        encoded = [b'' if missing else str(value).encode('utf-8')
+                   for value, missing in zip(series.tolist(), mask)]
+        arrays[key + '_offsets'] = np.cumsum([0] + [len(value) for value in encoded], dtype=np.int64)
+        arrays[key + '_data'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        arrays[key + '_mask'] = mask
+
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+def _read_npz(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """npz 데이터셋 읽기 (요청한 컬럼의 배열만 로드)"""
+    with np.load(path, allow_pickle=False) as npz:
+        names = npz['__columns__'].tolist()
+        dtypes = npz['__dtypes__'].tolist()
+        wanted = set(columns) if columns is not None else None
+
+        data = {}
+        for i, (name, dtype) in enumerate(zip(names, dtypes)):
+            if wanted is not None and name not in wanted:
+                continue
+            key = f'c{i}'
+            if key in npz.files:
+                values = npz[key]
+                if str(values.dtype) != dtype:
+                    # float로 저장한 nullable 정수/불리언 복원
+                    try:
+                        values = pd.Series(values).astype(dtype)
+                    except (TypeError, ValueError):
+                        pass
+                data[name] = values
+                continue
+
+            offsets = npz[key + '_offsets'].tolist()
+            blob = npz[key + '_data'].tobytes()
+            mask = npz[key + '_mask'].tolist()
+            values = [None if missing else blob[start:end].decode('utf-8')
+                      for start, end, missing in zip(offsets, offsets[1:], mask)]
+            data[name] = pd.Series(values, dtype='category' if dtype == 'category' else None)
+
+        rows = int(npz['__rows__'])
+
+    return pd.DataFrame(data, index=pd.RangeIndex(rows))
+
+class _CachedFrame:
+    """캐시 항목: 파일 시그니처(mtime, 크기)와 지금까지 읽은 컬럼"""
+
+    def __init__(self, signature, df: pd.DataFrame, complete: bool, absent: set):
+        self.signature = signature
+        self.df = df
+        self.complete = complete  # 전체 컬럼을 읽었는지 여부
+        self.absent = absent  # 요청했지만 파일에 없는 컬럼
+        self.nbytes = int(df.memory_usage(deep=True).sum())
+
+class DataFrameCache:
+    """(경로, mtime, 크기) 기준으로 무효화되는 프로세스 공용 DataFrame LRU 캐시 (메모리 한도 기반 제거)
+
+    같은 파일에 대한 컬럼 선택 읽기는 하나의 항목에 합쳐지므로
+    파일이 바뀌지 않는 한 각 컬럼은 한 번만 파싱됨
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else DATAFRAME_CACHE_MAX_MB * 1024 * 1024
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def read(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """캐시를 거쳐 데이터셋 읽기 (read_dataset과 같은 결과)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature != signature:
+                self._drop(path)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(path)
+
+        if entry is None or not self._covers(entry, columns):
+            entry = self._load(path, signature, entry, columns)
+
+        if columns is None:
+            df = entry.df
+        else:
+            df = entry.df[[column for column in columns if column in entry.df.columns]]
+        # 호출자가 열을 추가/변경해도 캐시된 원본에 영향이 없도록 얕은 복사본 반환
+        return df.copy(deep=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @staticmethod
+    def _covers(entry: _CachedFrame, columns: Optional[List[str]]) -> bool:
+        if entry.complete:
+            return True
+        if columns is None:
+            return False
+        return all(column in entry.df.columns or column in entry.absent for column in columns)
+
+    def _load(self, path: str, signature, entry: Optional[_CachedFrame],
+              columns: Optional[List[str]]) -> _CachedFrame:
+        """없는 컬럼만 읽어서 기존 항목과 합친 뒤 캐시에 저장"""
+        if entry is None or columns is None:
+            df = read_dataset(path, columns)
+            absent = set(columns) - set(df.columns) if columns is not None else set()
+        else:
+            missing = [column for column in columns
+                       if column not in entry.df.columns and column not in entry.absent]
+            loaded = read_dataset(path, missing)
+            df = pd.concat([entry.df, loaded], axis=1)
+            absent = entry.absent | (set(missing) - set(loaded.columns))
+
+        new_entry = _CachedFrame(signature, df, complete=columns is None, absent=absent)
+        with self._lock:
+            self._drop(path)
+            if new_entry.nbytes <= self.max_bytes:
+                self._entries[path] = new_entry
+                self._total_bytes += new_entry.nbytes
+                while self._total_bytes > self.max_bytes:
+                    oldest = next(iter(self._entries))
+                    self._drop(oldest)
+        return new_entry
+
+    def _drop(self, path: str):
+        """항목 제거 (호출자가 잠금을 보유해야 함)"""
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._total_bytes -= entry.nbytes
+
+dataframe_cache = DataFrameCache()
+
+def read_dataset_cached(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """프로세스 공용 캐시를 거쳐 데이터셋 읽기"""
+    return dataframe_cache.read(path, columns)